@@ -20,7 +20,15 @@
 
 from typing import (
     Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
     Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
     Union,
 )
 
@@ -30,72 +38,429 @@ from cmk.agent_based.v2 import (
     CheckPlugin,
     CheckResult,
     DiscoveryResult,
-    get_rate,
+    get_average,
     get_value_store,
-    GetRateError,
+    IgnoreResultsError,
+    Metric,
     render,
+    Result,
     Service,
+    State,
     StringTable,
 )
 
 
-UnboundSection = Mapping[str, Union[int, float, "UnboundSection"]]
+Number = Union[int, float]
+
+
+DEFAULT_INSTANCE = 'default'
+
+LATENCY_PERCENTILES = (50, 90, 95, 99)
+
+
+class HistogramBucket(NamedTuple):
+    lower: float
+    upper: float
+    count: Number
+
+
+class UnboundSection(Mapping[str, Number]):
+    """Statistics of one ``unbound-control stats_noreset`` run.
+
+    The stats are grouped once while parsing so the checks can access the
+    blocks they need directly. For compatibility the section still is a
+    read-only mapping of the original flat keys (e.g. ``total.num.queries``).
+    """
+
+    __slots__ = ('time', 'total', 'threads', 'histogram', 'latency', 'rcode', 'qtype', 'flags', 'mem', 'misc')
+
+    _GROUPS = (
+        ('histogram.summary.', 'latency'),
+        ('num.answer.rcode.', 'rcode'),
+        ('num.query.type.', 'qtype'),
+        ('num.query.flags.', 'flags'),
+        ('time.', 'time'),
+        ('total.', 'total'),
+        ('mem.', 'mem'),
+    )
+
+    def __init__(self) -> None:
+        self.time: Dict[str, float] = {}
+        self.total: Dict[str, Number] = {}
+        self.threads: Dict[int, Dict[str, Number]] = {}
+        self.histogram: Tuple[HistogramBucket, ...] = ()
+        # recursion time summary of agents configured with UNBOUND_HISTOGRAM=summary
+        self.latency: Dict[str, Number] = {}
+        self.rcode: Dict[str, int] = {}
+        self.qtype: Dict[str, int] = {}
+        self.flags: Dict[str, int] = {}
+        self.mem: Dict[str, int] = {}
+        self.misc: Dict[str, Number] = {}
+
+    @property
+    def now(self) -> Union[float, None]:
+        return self.time.get('now')
+
+    @property
+    def thread_count(self) -> int:
+        """Number of threads, also known if the agent left out their stats."""
+        return len(self.threads) or self.misc.get('num.threads', 1)
+
+    @property
+    def cache_age(self) -> Union[int, None]:
+        """Age of the snapshot if the agent reported it from its cache."""
+        return self.misc.get('cache.age')
+
+    @property
+    def is_stale(self) -> bool:
+        age = self.cache_age
+        return age is not None and age > self.misc.get('cache.max_age', age)
+
+    def _add(self, key: str, value: Number) -> None:
+        for prefix, group in self._GROUPS:
+            if key.startswith(prefix):
+                getattr(self, group)[key[len(prefix):]] = value
+                return
+        thread, _, name = key.partition('.')
+        if thread.startswith('thread') and thread[6:].isdigit():
+            self.threads.setdefault(int(thread[6:]), {})[name] = value
+        else:
+            self.misc[key] = value
+
+    def __getitem__(self, key: str) -> Number:
+        for prefix, group in self._GROUPS:
+            if key.startswith(prefix):
+                return getattr(self, group)[key[len(prefix):]]
+        thread, _, name = key.partition('.')
+        if thread.startswith('thread') and thread[6:].isdigit():
+            return self.threads[int(thread[6:])][name]
+        if key.startswith('histogram.'):
+            for bucket in self.histogram:
+                if _histogram_key(bucket) == key:
+                    return bucket.count
+        return self.misc[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for index, values in self.threads.items():
+            for name in values:
+                yield f'thread{index}.{name}'
+        for prefix, group in self._GROUPS:
+            for name in getattr(self, group):
+                yield f'{prefix}{name}'
+        for bucket in self.histogram:
+            yield _histogram_key(bucket)
+        yield from self.misc
+
+    def __len__(self) -> int:
+        return (
+            sum(len(values) for values in self.threads.values())
+            + sum(len(getattr(self, group)) for _prefix, group in self._GROUPS)
+            + len(self.histogram)
+            + len(self.misc)
+        )
+
+
+UnboundInstances = Mapping[str, UnboundSection]
+
+
+def _histogram_key(bucket: HistogramBucket) -> str:
+    def fmt(seconds: float) -> str:
+        return f'{int(seconds):06d}.{round(seconds % 1 * 1000000):06d}'
+    return f'histogram.{fmt(bucket.lower)}.to.{fmt(bucket.upper)}'
 
 
 def render_qps(x: float) -> str:
     return f'{x:.2f}/s'
 
 
-def parse_unbound(string_table: StringTable) -> UnboundSection:
-    section = {}
-    for key, value in string_table:
+def render_count(x: float) -> str:
+    return f'{x:.0f}'
+
+
+def render_ratio(x: float) -> str:
+    return f'{x:.2f}'
+
+
+def render_byte_rate(x: float) -> str:
+    return f'{render.bytes(x)}/s'
+
+
+def _stale_result(instance: UnboundSection) -> Result:
+    return Result(
+        state=State.UNKNOWN,
+        summary=f'Stale data from {render.timespan(instance.cache_age)} ago, rates not computed',
+    )
+
+
+class RatesUnavailable(IgnoreResultsError):
+    """No rates this time, e.g. because the counters were (re-)initialized."""
+
+
+def counter_rates(
+    instance: UnboundSection,
+    counters: Mapping[str, Number],
+    monotonic: bool = True,
+    store_key: str = 'unbound_counters',
+) -> Dict[str, float]:
+    """Rates per second of the counters of a service since its last check.
+
+    The counters are kept in one value store entry as a vector aligned to
+    their keys, together with the time and uptime of the last check. If
+    unbound was restarted (``time.up`` went backwards) or a monotonic counter
+    went backwards, all counters are re-initialized at once. Counters which
+    appeared since the last check (unbound only reports some of them once
+    they are non-zero) are initialized and left out of the rates, the others
+    are rated as usual. Cluster checks keep the counters of every node under
+    their own ``store_key``.
+    """
+    now = instance.now
+    if now is None:
+        raise RatesUnavailable('No timestamp in the agent output')
+    uptime = instance.time.get('up')
+    keys = tuple(counters)
+    values = tuple(counters.values())
+
+    value_store = get_value_store()
+    last = value_store.get(store_key)
+    if last is not None and last[0] == now:
+        # the agent reported the same snapshot again, keep the baseline
+        raise RatesUnavailable('No new data since the last check')
+    value_store[store_key] = (now, uptime, keys, values)
+
+    if last is None or len(last) != 4 or not isinstance(last[2], tuple):
+        raise RatesUnavailable('Initializing counters')
+    last_now, last_uptime, last_keys, last_values = last
+    if now < last_now or (uptime is not None and last_uptime is not None and uptime < last_uptime):
+        raise RatesUnavailable('Unbound was restarted, initializing counters')
+
+    if keys != last_keys:
+        # align on the counters present in both checks
+        previous = dict(zip(last_keys, last_values))
+        keys = tuple(key for key in keys if key in previous)
+        if not keys:
+            raise RatesUnavailable('Counters changed, initializing counters')
+        values = tuple(counters[key] for key in keys)
+        last_values = tuple(previous[key] for key in keys)
+
+    interval = now - last_now
+    rates = [(value - last_value) / interval for value, last_value in zip(values, last_values)]
+    if monotonic and any(rate < 0 for rate in rates):
+        raise RatesUnavailable('Counters were reset, initializing counters')
+    return dict(zip(keys, rates))
+
+
+def _node_rates(
+    item: str,
+    section: Mapping[str, Optional[UnboundInstances]],
+    counters: Callable[[UnboundSection], Optional[Mapping[str, Number]]],
+) -> Tuple[Dict[str, Dict[str, float]], List[Result]]:
+    """Rates of the counters of an instance on every node of a cluster.
+
+    Returns the rates per node and notices about the nodes left out because
+    of stale data. Nodes still initializing their counters are left out
+    silently, if no node has rates yet RatesUnavailable is raised.
+    """
+    rates = {}
+    notices = []
+    for node, node_section in section.items():
+        instance = node_section.get(item) if node_section is not None else None
+        if instance is None:
+            continue
+        if instance.is_stale:
+            notices.append(Result(
+                state=State.OK,
+                notice=f'{node}: stale data from {render.timespan(instance.cache_age)} ago, left out',
+            ))
+            continue
+        node_counters = counters(instance)
+        if node_counters is None:
+            continue
         try:
-            section[key] = int(value)
+            rates[node] = counter_rates(instance, node_counters, store_key=f'unbound_counters.{node}')
+        except RatesUnavailable:
+            continue
+    if not rates:
+        raise RatesUnavailable('No rates from any node yet')
+    return rates, notices
+
+
+def _cluster_now(
+    item: str,
+    section: Mapping[str, Optional[UnboundInstances]],
+    rates: Mapping[str, Any],
+) -> Optional[float]:
+    """Time of the latest snapshot of the nodes with rates."""
+    return max(
+        (
+            node_section[item].now
+            for node, node_section in section.items()
+            if node in rates and node_section is not None and node_section[item].now is not None
+        ),
+        default=None,
+    )
+
+
+def _check_node_imbalance(params: Mapping[str, Any], traffic: Mapping[str, float]) -> CheckResult:
+    """Compare the traffic of the busiest node to the mean of all nodes.
+
+    The ratio is at most the number of nodes (one node carrying all the
+    traffic, e.g. an active/standby pair), so there are no default levels.
+    """
+    mean = sum(traffic.values()) / len(traffic)
+    busiest = max(traffic, key=traffic.__getitem__)
+    yield from check_levels(
+        value=traffic[busiest] / mean if mean else 1.0,
+        levels_upper=params.get('levels_node_imbalance'),
+        metric_name='unbound_cluster_imbalance',
+        render_func=render_ratio,
+        label=f'Busiest node {busiest}, max/mean imbalance',
+        notice_only='levels_node_imbalance' not in params,
+    )
+    for node, rate in traffic.items():
+        yield Result(state=State.OK, notice=f'{node}: {render_qps(rate)}')
+
+
+def _check_averaged(
+    params: Mapping[str, Any],
+    now: Optional[float],
+    value: float,
+    metric_name: str,
+    label: str,
+    **kwargs: Any,
+) -> CheckResult:
+    """check_levels on the value averaged over the configured horizon.
+
+    Without an 'average' horizon the value is checked as is. Otherwise the
+    levels apply to the exponentially weighted moving average of the value,
+    the metric still reports the value of the interval.
+    """
+    horizon = params.get('average')
+    if not horizon or now is None:
+        yield from check_levels(value=value, metric_name=metric_name, label=label, **kwargs)
+        return
+    averaged = get_average(get_value_store(), f'unbound_average.{metric_name}', now, value, horizon / 60.0)
+    yield from check_levels(value=averaged, label=f'{label} ({render.timespan(horizon)} average)', **kwargs)
+    yield Metric(metric_name, value)
+
+
+def parse_unbound_instance(string_table: StringTable) -> UnboundSection:
+    section = UnboundSection()
+    histogram = []
+    for line in string_table:
+        if len(line) != 2:
+            continue
+        key, value = line
+        try:
+            parsed: Number = int(value)
         except ValueError:
-            section[key] = float(value)
+            parsed = float(value)
+
+        if key.startswith('histogram.') and '.to.' in key:
+            # histogram.000000.000512.to.000000.001024
+            _, lower_s, lower_us, _, upper_s, upper_us = key.split('.')
+            histogram.append(HistogramBucket(
+                float(f'{lower_s}.{lower_us}'),
+                float(f'{upper_s}.{upper_us}'),
+                parsed,
+            ))
+        else:
+            section._add(key, parsed)
+    section.histogram = tuple(sorted(histogram))
     return section
 
 
+def parse_unbound(string_table: StringTable) -> UnboundInstances:
+    """Split the agent output into the sub-sections of the unbound instances.
+
+    Agents configured with several instances prefix each instance's stats
+    with a ``[[[name]]]`` line, output without such a line belongs to the
+    instance ``default``.
+    """
+    instances: Dict[str, StringTable] = {}
+    lines = instances.setdefault(DEFAULT_INSTANCE, [])
+    for line in string_table:
+        if len(line) == 1 and line[0].startswith('[[[') and line[0].endswith(']]]'):
+            lines = instances.setdefault(line[0][3:-3], [])
+            continue
+        lines.append(line)
+    return {
+        name: section
+        for name, lines in instances.items()
+        if (section := parse_unbound_instance(lines))
+    }
+
+
 agent_section_unbound = AgentSection(
     name="unbound",
     parse_function=parse_unbound,
 )
 
 
-def discover_unbound_cache(section: UnboundSection) -> DiscoveryResult:
-    if 'total.num.cachehits' in section and 'total.num.cachemiss' in section:
-        yield Service()
+UNBOUND_CACHE_TABLES = (
+    # key prefix, label, shown by the cache service
+    ('msg', 'Message cache', True),
+    ('rrset', 'RRset cache', True),
+    ('infra', 'Infrastructure cache', False),
+    ('key', 'Key cache', False),
+)
+
+
+def discover_unbound_cache(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if 'num.cachehits' in instance.total and 'num.cachemiss' in instance.total:
+            yield Service(item=item)
 
 
 def check_unbound_cache(
+    item: str,
     params: Mapping[str, Any],
-    section: UnboundSection,
+    section: UnboundInstances,
 ) -> CheckResult:
-    cumulative_cache_hits = section.get('total.num.cachehits')
-    cumulative_cache_miss = section.get('total.num.cachemiss')
-    now = section.get('time.now')
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
 
-    if None in (cumulative_cache_hits, cumulative_cache_miss, now):
+    counters = _cache_counters(instance)
+    if counters is None:
         return
 
-    cache_hits = get_rate(
-        get_value_store(),
-        'unbound_cache_hits',
-        now,
-        cumulative_cache_hits,
-        raise_overflow=True,
-    )
-    cache_miss = get_rate(
-        get_value_store(),
-        'unbound_cache_miss',
-        now,
-        cumulative_cache_miss,
-        raise_overflow=True,
-    )
+    rates = counter_rates(instance, counters)
+    yield from _check_cache_rates(params, instance.now, rates['num.cachehits'], rates['num.cachemiss'])
+
+    for name, label, shown in UNBOUND_CACHE_TABLES:
+        if shown and f'{name}.cache.count' in instance.misc:
+            yield from check_levels(
+                value=instance.misc[f'{name}.cache.count'],
+                metric_name=f'unbound_cache_{name}_entries',
+                render_func=render_count,
+                label=f'{label} entries',
+            )
+
+
+def _cache_counters(instance: UnboundSection) -> Optional[Dict[str, Number]]:
+    if 'num.cachehits' not in instance.total or 'num.cachemiss' not in instance.total:
+        return None
+    return {
+        'num.cachehits': instance.total['num.cachehits'],
+        'num.cachemiss': instance.total['num.cachemiss'],
+    }
+
+
+def _check_cache_rates(
+    params: Mapping[str, Any],
+    now: Optional[float],
+    cache_hits: float,
+    cache_miss: float,
+) -> CheckResult:
     total = cache_hits + cache_miss
     hit_perc = (cache_hits / float(total)) * 100.0 if total != 0 else 100.0
 
-    yield from check_levels(
+    yield from _check_averaged(
+        params,
+        now,
         value=cache_miss,
         metric_name="cache_misses_rate",
         levels_upper=params.get("cache_misses"),
@@ -112,7 +477,9 @@ def check_unbound_cache(
         notice_only=True,
     )
 
-    yield from check_levels(
+    yield from _check_averaged(
+        params,
+        now,
         value=hit_perc,
         metric_name="cache_hit_ratio",
         levels_lower=params.get("cache_hits"),
@@ -121,73 +488,121 @@ def check_unbound_cache(
     )
 
 
+def cluster_check_unbound_cache(
+    item: str,
+    params: Mapping[str, Any],
+    section: Mapping[str, Optional[UnboundInstances]],
+) -> CheckResult:
+    rates, notices = _node_rates(item, section, _cache_counters)
+    cache_hits = sum(node['num.cachehits'] for node in rates.values())
+    cache_miss = sum(node['num.cachemiss'] for node in rates.values())
+    yield from _check_cache_rates(params, _cluster_now(item, section, rates), cache_hits, cache_miss)
+    yield from _check_node_imbalance(params, {
+        node: node_rates['num.cachehits'] + node_rates['num.cachemiss']
+        for node, node_rates in rates.items()
+    })
+    yield from notices
+
+
 check_plugin_unbound_cache = CheckPlugin(
     name="unbound_cache",
-    service_name="Unbound Cache",
+    service_name="Unbound Cache %s",
     sections=["unbound"],
     discovery_function=discover_unbound_cache,
     check_function=check_unbound_cache,
+    cluster_check_function=cluster_check_unbound_cache,
     check_default_parameters={},
     check_ruleset_name="unbound_cache",
 )
 
 
-def discover_unbound_answers(section: UnboundSection) -> DiscoveryResult:
-    if 'time.now' in section and 'num.answer.rcode.SERVFAIL' in section:
-        yield Service()
+def discover_unbound_answers(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'SERVFAIL' in instance.rcode:
+            yield Service(item=item)
 
 
-def check_unbound_answers(params: Mapping, section: UnboundSection) -> CheckResult:
-    key_prefix = 'num.answer.rcode.'
-    if 'time.now' not in section:
+def check_unbound_answers(
+    item: str,
+    params: Mapping,
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None:
         return
 
-    now = section['time.now']
+    rates = counter_rates(instance, instance.rcode)
+    yield from _check_answer_rates(params, instance.now, rates)
 
-    total = sum(
-        value for key, value in section.items()
-        if key.startswith(key_prefix)
+
+def _check_answer_rates(
+    params: Mapping[str, Any],
+    now: Optional[float],
+    rates: Mapping[str, float],
+) -> CheckResult:
+    # nodata answers are also counted as NOERROR
+    answer_rate = sum(rate for answer, rate in rates.items() if answer != 'nodata')
+    yield from check_levels(
+        value=answer_rate,
+        metric_name='unbound_answers_rate',
+        render_func=render_qps,
+        label='Answers',
     )
 
-    for key, value in section.items():
-        if not key.startswith(key_prefix):
-            continue
-        answer = key[len(key_prefix):]
+    for answer, rate in rates.items():
+        yield from _check_averaged(
+            params,
+            now,
+            value=rate,
+            levels_upper=params.get(f'levels_upper_{answer}'),
+            metric_name=f'unbound_answers_{answer}',
+            render_func=render_qps,
+            label=answer,
+            notice_only=f'levels_upper_{answer}' not in params,
+        )
+        yield from _check_averaged(
+            params,
+            now,
+            value=rate * 100.0 / answer_rate if answer_rate else 0.0,
+            levels_upper=params.get(f'levels_ratio_{answer}'),
+            metric_name=f'unbound_answers_{answer}_ratio',
+            render_func=render.percent,
+            label=f'{answer} share',
+            notice_only=f'levels_ratio_{answer}' not in params,
+        )
 
-        try:
-            rate = get_rate(
-                get_value_store(),
-                f'unbound_answers_{answer}',
-                now,
-                value,
-                raise_overflow=True,
-            )
-        except GetRateError:
-            pass
-        else:
-            levels_upper = params.get(f'levels_upper_{answer}')
-            if levels_upper is not None and len(levels_upper) == 3:
-                # levels on the ratio of answers
-                levels_upper = (
-                    levels_upper[0] * total,
-                    levels_upper[1] * total,
-                )
-            yield from check_levels(
-                value=rate,
-                levels_upper=levels_upper,
-                metric_name=f'unbound_answers_{answer}',
-                render_func=render_qps,
-                label=answer,
-                notice_only=f'levels_upper_{answer}' not in params,
-            )
+
+def cluster_check_unbound_answers(
+    item: str,
+    params: Mapping[str, Any],
+    section: Mapping[str, Optional[UnboundInstances]],
+) -> CheckResult:
+    rates, notices = _node_rates(item, section, lambda instance: instance.rcode)
+    pool_rates: Dict[str, float] = {}
+    for node in rates.values():
+        for answer, rate in node.items():
+            pool_rates[answer] = pool_rates.get(answer, 0.0) + rate
+    yield from _check_answer_rates(params, _cluster_now(item, section, rates), pool_rates)
+    yield from _check_node_imbalance(params, {
+        node: sum(rate for answer, rate in node_rates.items() if answer != 'nodata')
+        for node, node_rates in rates.items()
+    })
+    yield from notices
 
 
 check_plugin_unbound_answers = CheckPlugin(
     name="unbound_answers",
-    service_name="Unbound Answers",
+    service_name="Unbound Answers %s",
     sections=["unbound"],
     discovery_function=discover_unbound_answers,
     check_function=check_unbound_answers,
+    cluster_check_function=cluster_check_unbound_answers,
     check_default_parameters={
         'levels_upper_SERVFAIL': ('fixed', (10, 100)),
         'levels_upper_REFUSED': ('fixed', (10, 100)),
@@ -196,23 +611,41 @@ check_plugin_unbound_answers = CheckPlugin(
 )
 
 
-def discover_unbound_unwanted_replies(section: UnboundSection) -> DiscoveryResult:
-    if 'time.now' in section and 'unwanted.replies' in section:
-        yield Service()
+def discover_unbound_unwanted_replies(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'unwanted.replies' in instance.misc:
+            yield Service(item=item)
 
 
-def check_unbound_unwanted_replies(section: UnboundSection) -> CheckResult:
-    if 'time.now' not in section or 'unwanted.replies' not in section:
+def check_unbound_unwanted_replies(
+    item: str,
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
         return
 
-    rate = get_rate(
-        get_value_store(),
-        'unbound_unwanted_replies',
-        section['time.now'],
-        section['unwanted.replies'],
-        raise_overflow=True,
-    )
+    if instance.now is None:
+        return
+
+    counters = _unwanted_replies_counters(instance)
+    if counters is None:
+        return
+
+    rates = counter_rates(instance, counters)
+    yield from _check_unwanted_replies_rate(rates['unwanted.replies'])
 
+
+def _unwanted_replies_counters(instance: UnboundSection) -> Optional[Dict[str, Number]]:
+    if 'unwanted.replies' not in instance.misc:
+        return None
+    return {'unwanted.replies': instance.misc['unwanted.replies']}
+
+
+def _check_unwanted_replies_rate(rate: float) -> CheckResult:
     yield from check_levels(
         value=rate,
         levels_upper=('fixed', (10, 100)),
@@ -222,10 +655,1137 @@ def check_unbound_unwanted_replies(section: UnboundSection) -> CheckResult:
     )
 
 
+def cluster_check_unbound_unwanted_replies(
+    item: str,
+    section: Mapping[str, Optional[UnboundInstances]],
+) -> CheckResult:
+    rates, notices = _node_rates(item, section, _unwanted_replies_counters)
+    yield from _check_unwanted_replies_rate(sum(node['unwanted.replies'] for node in rates.values()))
+    for node, node_rates in rates.items():
+        yield Result(state=State.OK, notice=f'{node}: {render_qps(node_rates["unwanted.replies"])}')
+    yield from notices
+
+
 check_plugin_unbound_unwanted_replies = CheckPlugin(
     name="unbound_unwanted_replies",
-    service_name="Unbound Unwanted Replies",
+    service_name="Unbound Unwanted Replies %s",
     sections=["unbound"],
     discovery_function=discover_unbound_unwanted_replies,
     check_function=check_unbound_unwanted_replies,
+    cluster_check_function=cluster_check_unbound_unwanted_replies,
+)
+
+
+def _interpolate_percentile(
+    buckets: Sequence[HistogramBucket],
+    total: Number,
+    percentile: float,
+) -> float:
+    target = total * percentile / 100.0
+    cumulative = 0
+    for lower, upper, count in buckets:
+        if count and cumulative + count >= target:
+            return lower + (upper - lower) * (target - cumulative) / count
+        cumulative += count
+    return buckets[-1][1]
+
+
+def discover_unbound_recursion_latency(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.latency or (instance.now is not None and instance.histogram):
+            yield Service(item=item)
+
+
+def _interval_latency(instance: UnboundSection) -> Dict[str, Number]:
+    """Summarize the histogram buckets since the last check like the agent does"""
+    rates = counter_rates(instance, {_histogram_key(bucket): bucket.count for bucket in instance.histogram})
+    # the percentiles of the reply rates are the same as of the reply counts
+    interval = [
+        bucket._replace(count=rates[_histogram_key(bucket)])
+        for bucket in instance.histogram
+        if _histogram_key(bucket) in rates
+    ]
+    if not interval:
+        raise RatesUnavailable('Initializing histogram counters')
+
+    total = sum(bucket.count for bucket in interval)
+    latency: Dict[str, Number] = {'count': total}
+    if total:
+        for percentile in LATENCY_PERCENTILES:
+            latency[f'p{percentile}'] = _interpolate_percentile(interval, total, percentile)
+        latency['max'] = [bucket.upper for bucket in interval if bucket.count][-1]
+    return latency
+
+
+def check_unbound_recursion_latency(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.latency:
+        latency = instance.latency
+        if not latency.get('interval'):
+            raise IgnoreResultsError('Initializing histogram counters')
+    elif instance.now is not None and instance.histogram:
+        latency = _interval_latency(instance)
+    else:
+        return
+
+    if not latency['count']:
+        yield Result(state=State.OK, summary='No recursive replies in interval')
+        return
+
+    for percentile in LATENCY_PERCENTILES:
+        yield from check_levels(
+            value=latency[f'p{percentile}'],
+            levels_upper=params.get(f'levels_p{percentile}'),
+            metric_name=f'unbound_recursion_latency_p{percentile}',
+            render_func=render.timespan,
+            label=f'{percentile}th percentile',
+        )
+    yield Result(state=State.OK, notice=f'Slowest replies: below {render.timespan(latency["max"])}')
+
+
+check_plugin_unbound_recursion_latency = CheckPlugin(
+    name="unbound_recursion_latency",
+    service_name="Unbound Recursion Latency %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_recursion_latency,
+    check_function=check_unbound_recursion_latency,
+    check_default_parameters={},
+    check_ruleset_name="unbound_recursion_latency",
+)
+
+
+def discover_unbound_threads(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and len(instance.threads) > 1:
+            yield Service(item=item)
+
+
+def check_unbound_threads(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or not instance.threads:
+        return
+
+    thread_rates = counter_rates(instance, {
+        f'thread{index}.num.queries': thread['num.queries']
+        for index, thread in sorted(instance.threads.items())
+        if 'num.queries' in thread
+    })
+    rates = {
+        index: thread_rates[f'thread{index}.num.queries']
+        for index in sorted(instance.threads)
+        if f'thread{index}.num.queries' in thread_rates
+    }
+    if not rates:
+        return
+
+    hottest = max(rates, key=rates.__getitem__)
+    mean = sum(rates.values()) / len(rates)
+    imbalance = rates[hottest] / mean if mean else 1.0
+
+    yield from check_levels(
+        value=imbalance,
+        levels_upper=params.get('imbalance'),
+        metric_name='unbound_threads_imbalance',
+        render_func=render_ratio,
+        label='Max/mean imbalance',
+    )
+    yield Result(state=State.OK, summary=f'Hottest thread: {hottest} ({render_qps(rates[hottest])})')
+    yield Metric('unbound_threads_max_queries_rate', rates[hottest])
+    yield Metric('unbound_threads_mean_queries_rate', mean)
+
+    for index, rate in rates.items():
+        thread = instance.threads[index]
+        yield Result(state=State.OK, notice=f'Thread {index}: {render_qps(rate)}')
+        if 'requestlist.current.all' in thread:
+            yield from check_levels(
+                value=thread['requestlist.current.all'],
+                levels_upper=params.get('requestlist'),
+                render_func=render_count,
+                label=f'Thread {index} request list',
+                notice_only=True,
+            )
+        if 'recursion.time.avg' in thread:
+            yield Result(
+                state=State.OK,
+                notice=f'Thread {index} average recursion time: {render.timespan(thread["recursion.time.avg"])}',
+            )
+
+
+check_plugin_unbound_threads = CheckPlugin(
+    name="unbound_threads",
+    service_name="Unbound Threads %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_threads,
+    check_function=check_unbound_threads,
+    check_default_parameters={},
+    check_ruleset_name="unbound_threads",
+)
+
+
+UNBOUND_CACHES = (
+    # mem key, parameter with the configured size, label
+    ('cache.message', 'msg_cache_size', 'Message cache'),
+    ('cache.rrset', 'rrset_cache_size', 'RRset cache'),
+)
+
+
+def discover_unbound_memory(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and instance.mem:
+            yield Service(item=item)
+
+
+def check_unbound_memory(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or not instance.mem:
+        return
+
+    yield from check_levels(
+        value=sum(instance.mem.values()),
+        levels_upper=params.get('levels'),
+        metric_name='unbound_mem_total',
+        render_func=render.bytes,
+        label='Total',
+    )
+
+    try:
+        growth_rates = counter_rates(
+            instance,
+            {key: instance.mem[key] for key, *_ in UNBOUND_CACHES if key in instance.mem},
+            monotonic=False,
+        )
+    except RatesUnavailable:
+        growth_rates = {}
+
+    for key, size_param, label in UNBOUND_CACHES:
+        if key not in instance.mem:
+            continue
+        used = instance.mem[key]
+        size = params[size_param]
+        metric_name = f'unbound_mem_{key.replace(".", "_")}'
+
+        yield from check_levels(
+            value=used * 100.0 / size,
+            levels_upper=params.get('levels_fill'),
+            metric_name=f'{metric_name}_fill',
+            render_func=render.percent,
+            label=f'{label} fill',
+        )
+
+        if key not in growth_rates:
+            continue
+        growth = growth_rates[key]
+        yield from check_levels(
+            value=growth,
+            metric_name=f'{metric_name}_growth',
+            render_func=render_byte_rate,
+            label=f'{label} growth',
+            notice_only=True,
+        )
+        if growth > 0:
+            yield from check_levels(
+                value=max(size - used, 0) / growth,
+                levels_lower=params.get('levels_time_left'),
+                render_func=render.timespan,
+                label=f'{label} full in',
+                notice_only=True,
+            )
+
+    for key, value in instance.mem.items():
+        yield from check_levels(
+            value=value,
+            metric_name=f'unbound_mem_{key.replace(".", "_")}',
+            render_func=render.bytes,
+            label=key,
+            notice_only=True,
+        )
+
+
+check_plugin_unbound_memory = CheckPlugin(
+    name="unbound_memory",
+    service_name="Unbound Memory %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_memory,
+    check_function=check_unbound_memory,
+    check_default_parameters={
+        # unbound's defaults for msg-cache-size and rrset-cache-size
+        'msg_cache_size': 4 * 1024 * 1024,
+        'rrset_cache_size': 4 * 1024 * 1024,
+    },
+    check_ruleset_name="unbound_memory",
+)
+
+
+UNBOUND_REQUESTLIST_COUNTERS = (
+    # total key, parameter, metric, label
+    ('requestlist.exceeded', 'levels_exceeded', 'unbound_requestlist_exceeded', 'Exceeded'),
+    ('requestlist.overwritten', 'levels_overwritten', 'unbound_requestlist_overwritten', 'Overwritten'),
+    ('num.queries_timed_out', 'levels_timed_out', 'unbound_queries_timed_out', 'Timed out'),
+)
+
+
+def discover_unbound_requestlist(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'requestlist.current.all' in instance.total:
+            yield Service(item=item)
+
+
+def check_unbound_requestlist(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'requestlist.current.all' not in instance.total:
+        return
+
+    current = instance.total['requestlist.current.all']
+    capacity = params['num_queries_per_thread'] * instance.thread_count
+    yield from check_levels(
+        value=current * 100.0 / capacity,
+        levels_upper=params.get('levels_utilization'),
+        metric_name='unbound_requestlist_utilization',
+        render_func=render.percent,
+        label='Utilization',
+    )
+    yield Result(state=State.OK, summary=f'{current} of {capacity} requests')
+    yield Metric('unbound_requestlist_current', current, boundaries=(0, capacity))
+
+    try:
+        rates = counter_rates(instance, {
+            key: instance.total[key] for key, *_ in UNBOUND_REQUESTLIST_COUNTERS if key in instance.total
+        })
+    except RatesUnavailable:
+        rates = {}
+
+    for key, param, metric_name, label in UNBOUND_REQUESTLIST_COUNTERS:
+        if key not in rates:
+            continue
+        yield from check_levels(
+            value=rates[key],
+            levels_upper=params.get(param),
+            metric_name=metric_name,
+            render_func=render_qps,
+            label=label,
+            notice_only=param not in params,
+        )
+
+    if 'query.queue_time_us.max' in instance.total:
+        yield from check_levels(
+            value=instance.total['query.queue_time_us.max'] / 1000000.0,
+            levels_upper=params.get('levels_queue_time'),
+            metric_name='unbound_queue_time_max',
+            render_func=render.timespan,
+            label='Max queue time',
+            notice_only='levels_queue_time' not in params,
+        )
+
+
+check_plugin_unbound_requestlist = CheckPlugin(
+    name="unbound_requestlist",
+    service_name="Unbound Request List %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_requestlist,
+    check_function=check_unbound_requestlist,
+    check_default_parameters={
+        # unbound's default for num-queries-per-thread
+        'num_queries_per_thread': 1024,
+        'levels_utilization': ('fixed', (80.0, 90.0)),
+    },
+    check_ruleset_name="unbound_requestlist",
+)
+
+
+UNBOUND_TRANSPORTS = (
+    # key, metric, label
+    ('num.query.tcp', 'unbound_queries_tcp_rate', 'TCP'),
+    ('num.query.tls', 'unbound_queries_tls_rate', 'TLS'),
+    ('num.query.https', 'unbound_queries_https_rate', 'HTTPS'),
+    ('num.query.ipv6', 'unbound_queries_ipv6_rate', 'IPv6'),
+)
+
+
+def discover_unbound_queries(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'num.queries' in instance.total:
+            yield Service(item=item)
+
+
+def check_unbound_queries(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'num.queries' not in instance.total:
+        return
+
+    counters = {key: instance.misc[key] for key, *_ in UNBOUND_TRANSPORTS if key in instance.misc}
+    counters['num.queries'] = instance.total['num.queries']
+    rates = counter_rates(instance, counters)
+
+    yield from check_levels(
+        value=rates['num.queries'],
+        levels_upper=params.get('levels_upper'),
+        levels_lower=params.get('levels_lower'),
+        metric_name='unbound_queries_rate',
+        render_func=render_qps,
+        label='Queries',
+    )
+
+    for key, metric_name, label in UNBOUND_TRANSPORTS:
+        if key not in rates:
+            continue
+        yield from check_levels(
+            value=rates[key],
+            metric_name=metric_name,
+            render_func=render_qps,
+            label=label,
+            notice_only=True,
+        )
+
+
+check_plugin_unbound_queries = CheckPlugin(
+    name="unbound_queries",
+    service_name="Unbound Queries %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_queries,
+    check_function=check_unbound_queries,
+    check_default_parameters={},
+    check_ruleset_name="unbound_queries",
+)
+
+
+UNBOUND_PREFETCH_COUNTERS = ('num.prefetch', 'num.expired', 'num.cachehits', 'num.queries', 'num.recursivereplies')
+
+
+def discover_unbound_prefetch(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'num.prefetch' in instance.total and 'num.expired' in instance.total:
+            yield Service(item=item)
+
+
+def check_unbound_prefetch(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'num.prefetch' not in instance.total or 'num.expired' not in instance.total:
+        return
+
+    rates = counter_rates(instance, {
+        key: instance.total[key] for key in UNBOUND_PREFETCH_COUNTERS if key in instance.total
+    })
+    if 'num.prefetch' not in rates or 'num.expired' not in rates:
+        return
+
+    yield from check_levels(
+        value=rates['num.prefetch'],
+        metric_name='unbound_prefetch_rate',
+        render_func=render_qps,
+        label='Prefetches',
+    )
+    if 'num.cachehits' in rates:
+        cache_hits = rates['num.cachehits']
+        yield from check_levels(
+            value=rates['num.prefetch'] * 100.0 / cache_hits if cache_hits else 0.0,
+            levels_upper=params.get('levels_prefetch_ratio'),
+            metric_name='unbound_prefetch_ratio',
+            render_func=render.percent,
+            label='Prefetches of cache hits',
+        )
+
+    yield from check_levels(
+        value=rates['num.expired'],
+        levels_upper=params.get('levels_expired'),
+        metric_name='unbound_expired_rate',
+        render_func=render_qps,
+        label='Expired answers',
+    )
+    if 'num.queries' in rates:
+        queries = rates['num.queries']
+        yield from check_levels(
+            value=rates['num.expired'] * 100.0 / queries if queries else 0.0,
+            levels_upper=params.get('levels_expired_ratio'),
+            metric_name='unbound_expired_ratio',
+            render_func=render.percent,
+            label='Expired answers of queries',
+        )
+
+    if 'num.recursivereplies' in rates:
+        yield from check_levels(
+            value=rates['num.recursivereplies'],
+            metric_name='unbound_recursive_replies_rate',
+            render_func=render_qps,
+            label='Recursive replies',
+            notice_only=True,
+        )
+
+
+check_plugin_unbound_prefetch = CheckPlugin(
+    name="unbound_prefetch",
+    service_name="Unbound Prefetch %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_prefetch,
+    check_function=check_unbound_prefetch,
+    check_default_parameters={},
+    check_ruleset_name="unbound_prefetch",
+)
+
+
+UNBOUND_DNSSEC_COUNTERS = (
+    # key, parameter, metric, label
+    ('num.answer.secure', None, 'unbound_answers_secure_rate', 'Secure answers'),
+    ('num.answer.bogus', 'levels_bogus', 'unbound_answers_bogus_rate', 'Bogus answers'),
+    ('num.rrset.bogus', 'levels_rrset_bogus', 'unbound_rrset_bogus_rate', 'Bogus RRsets'),
+)
+
+
+def discover_unbound_dnssec(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'num.answer.secure' in instance.misc and 'num.answer.bogus' in instance.misc:
+            yield Service(item=item)
+
+
+def check_unbound_dnssec(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'num.answer.secure' not in instance.misc or 'num.answer.bogus' not in instance.misc:
+        return
+
+    counters = {key: instance.misc[key] for key, *_ in UNBOUND_DNSSEC_COUNTERS if key in instance.misc}
+    # nodata answers are also counted as NOERROR
+    counters['answers'] = sum(value for rcode, value in instance.rcode.items() if rcode != 'nodata')
+
+    rates = counter_rates(instance, counters)
+    if 'num.answer.secure' not in rates or 'num.answer.bogus' not in rates or 'answers' not in rates:
+        return
+
+    for key, param, metric_name, label in UNBOUND_DNSSEC_COUNTERS:
+        if key not in rates:
+            continue
+        yield from check_levels(
+            value=rates[key],
+            levels_upper=params.get(param) if param else None,
+            metric_name=metric_name,
+            render_func=render_qps,
+            label=label,
+            notice_only=param not in params,
+        )
+
+    answer_rate = rates['answers']
+    yield from check_levels(
+        value=rates['num.answer.bogus'] * 100.0 / answer_rate if answer_rate else 0.0,
+        levels_upper=params.get('levels_bogus_ratio'),
+        metric_name='unbound_answers_bogus_ratio',
+        render_func=render.percent,
+        label='Bogus of all answers',
+    )
+    yield from check_levels(
+        value=rates['num.answer.secure'] * 100.0 / answer_rate if answer_rate else 0.0,
+        metric_name='unbound_answers_secure_ratio',
+        render_func=render.percent,
+        label='Secure of all answers',
+        notice_only=True,
+    )
+
+
+check_plugin_unbound_dnssec = CheckPlugin(
+    name="unbound_dnssec",
+    service_name="Unbound DNSSEC %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_dnssec,
+    check_function=check_unbound_dnssec,
+    check_default_parameters={},
+    check_ruleset_name="unbound_dnssec",
+)
+
+
+def discover_unbound_cache_tables(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and any(f'{name}.cache.count' in instance.misc for name, *_ in UNBOUND_CACHE_TABLES):
+            yield Service(item=item)
+
+
+def check_unbound_cache_tables(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None:
+        return
+
+    try:
+        growth_rates = counter_rates(
+            instance,
+            {
+                key: instance.misc[key]
+                for key in (f'{name}.cache.count' for name, *_ in UNBOUND_CACHE_TABLES)
+                if key in instance.misc
+            },
+            monotonic=False,
+        )
+    except RatesUnavailable:
+        growth_rates = {}
+
+    for name, label, _shown in UNBOUND_CACHE_TABLES:
+        if f'{name}.cache.count' not in instance.misc:
+            continue
+        entries = instance.misc[f'{name}.cache.count']
+        yield from check_levels(
+            value=entries,
+            metric_name=f'unbound_cache_{name}_entries',
+            render_func=render_count,
+            label=f'{label} entries',
+        )
+
+        if f'{name}.cache.max_collisions' in instance.misc:
+            yield from check_levels(
+                value=instance.misc[f'{name}.cache.max_collisions'],
+                levels_upper=params.get('levels_collisions'),
+                metric_name=f'unbound_cache_{name}_collisions',
+                render_func=render_count,
+                label=f'{label} max collisions',
+                notice_only='levels_collisions' not in params,
+            )
+
+        if f'{name}.cache.count' not in growth_rates:
+            continue
+        yield from check_levels(
+            value=growth_rates[f'{name}.cache.count'],
+            levels_upper=params.get('levels_growth'),
+            metric_name=f'unbound_cache_{name}_growth',
+            render_func=render_qps,
+            label=f'{label} growth',
+            notice_only='levels_growth' not in params,
+        )
+
+
+check_plugin_unbound_cache_tables = CheckPlugin(
+    name="unbound_cache_tables",
+    service_name="Unbound Cache Tables %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_cache_tables,
+    check_function=check_unbound_cache_tables,
+    check_default_parameters={},
+    check_ruleset_name="unbound_cache_tables",
+)
+
+
+def discover_unbound_uptime(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'up' in instance.time:
+            yield Service(item=item)
+
+
+def check_unbound_uptime(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'up' not in instance.time:
+        return
+
+    uptime = instance.time['up']
+    yield Result(state=State.OK, summary=f'Up since {render.datetime(instance.now - uptime)}')
+    yield from check_levels(
+        value=uptime,
+        levels_lower=params.get('levels_lower'),
+        metric_name='uptime',
+        render_func=render.timespan,
+        label='Uptime',
+    )
+
+
+check_plugin_unbound_uptime = CheckPlugin(
+    name="unbound_uptime",
+    service_name="Unbound Uptime %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_uptime,
+    check_function=check_unbound_uptime,
+    check_default_parameters={},
+    check_ruleset_name="unbound_uptime",
+)
+
+
+def discover_unbound_ecs_cachedb(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and ('num.query.subnet' in instance.misc or 'num.query.cachedb' in instance.misc):
+            yield Service(item=item)
+
+
+def check_unbound_ecs_cachedb(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None:
+        return
+
+    counters = {
+        key: instance.misc[key]
+        for key in ('num.query.subnet', 'num.query.subnet_cache', 'num.query.cachedb')
+        if key in instance.misc
+    }
+    if 'num.cachemiss' in instance.total:
+        counters['num.cachemiss'] = instance.total['num.cachemiss']
+    rates = counter_rates(instance, counters)
+
+    if 'num.query.subnet' in rates and 'num.query.subnet_cache' in rates:
+        subnet = rates['num.query.subnet']
+        subnet_cache = rates['num.query.subnet_cache']
+        yield from check_levels(
+            value=subnet,
+            metric_name='unbound_subnet_rate',
+            render_func=render_qps,
+            label='ECS queries',
+            notice_only=True,
+        )
+        yield from check_levels(
+            value=subnet_cache,
+            metric_name='unbound_subnet_cache_rate',
+            render_func=render_qps,
+            label='ECS cache hits',
+            notice_only=True,
+        )
+        yield from check_levels(
+            value=subnet_cache * 100.0 / subnet if subnet else 100.0,
+            levels_lower=params.get('levels_subnet_hit_ratio'),
+            metric_name='unbound_subnet_hit_ratio',
+            render_func=render.percent,
+            label='ECS cache hit ratio',
+        )
+
+    if 'num.query.subnet' in instance.misc and 'mod.subnet' in instance.mem:
+        yield from check_levels(
+            value=instance.mem['mod.subnet'],
+            levels_upper=params.get('levels_subnet_memory'),
+            metric_name='unbound_mem_mod_subnet',
+            render_func=render.bytes,
+            label='ECS module memory',
+            notice_only='levels_subnet_memory' not in params,
+        )
+
+    if 'num.query.cachedb' in rates and 'num.cachemiss' in rates:
+        cachedb = rates['num.query.cachedb']
+        cache_miss = rates['num.cachemiss']
+        yield from check_levels(
+            value=cachedb,
+            metric_name='unbound_cachedb_rate',
+            render_func=render_qps,
+            label='Cachedb hits',
+            notice_only=True,
+        )
+        # the cachedb backend is only asked on a miss of the internal caches
+        yield from check_levels(
+            value=cachedb * 100.0 / cache_miss if cache_miss else 100.0,
+            levels_lower=params.get('levels_cachedb_hit_ratio'),
+            metric_name='unbound_cachedb_hit_ratio',
+            render_func=render.percent,
+            label='Cachedb hit ratio',
+        )
+
+
+check_plugin_unbound_ecs_cachedb = CheckPlugin(
+    name="unbound_ecs_cachedb",
+    service_name="Unbound ECS and Cachedb %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_ecs_cachedb,
+    check_function=check_unbound_ecs_cachedb,
+    check_default_parameters={},
+    check_ruleset_name="unbound_ecs_cachedb",
+)
+
+
+def discover_unbound_upstream(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'num.query.udpout' in instance.misc and 'num.query.tcpout' in instance.misc:
+            yield Service(item=item)
+
+
+def check_unbound_upstream(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'num.query.udpout' not in instance.misc or 'num.query.tcpout' not in instance.misc:
+        return
+
+    counters = {
+        'num.query.udpout': instance.misc['num.query.udpout'],
+        'num.query.tcpout': instance.misc['num.query.tcpout'],
+    }
+    for key in ('num.recursivereplies', 'num.queries'):
+        if key in instance.total:
+            counters[key] = instance.total[key]
+    rates = counter_rates(instance, counters)
+
+    udp = rates['num.query.udpout']
+    tcp = rates['num.query.tcpout']
+    outgoing = udp + tcp
+    yield from check_levels(
+        value=outgoing,
+        levels_upper=params.get('levels_upstream'),
+        metric_name='unbound_upstream_rate',
+        render_func=render_qps,
+        label='Outgoing queries',
+    )
+    yield Metric('unbound_upstream_udp_rate', udp)
+    yield Metric('unbound_upstream_tcp_rate', tcp)
+
+    if 'num.recursivereplies' in rates:
+        recursive_replies = rates['num.recursivereplies']
+        yield from check_levels(
+            value=outgoing / recursive_replies if recursive_replies else 0.0,
+            levels_upper=params.get('levels_amplification'),
+            metric_name='unbound_upstream_amplification',
+            render_func=render_ratio,
+            label='Outgoing queries per recursive reply',
+        )
+    if 'num.queries' in rates:
+        queries = rates['num.queries']
+        yield from check_levels(
+            value=outgoing / queries if queries else 0.0,
+            metric_name='unbound_upstream_per_query',
+            render_func=render_ratio,
+            label='Outgoing queries per client query',
+            notice_only=True,
+        )
+
+    yield from check_levels(
+        value=tcp * 100.0 / outgoing if outgoing else 0.0,
+        levels_upper=params.get('levels_tcp_share'),
+        metric_name='unbound_upstream_tcp_share',
+        render_func=render.percent,
+        label='TCP share',
+        notice_only='levels_tcp_share' not in params,
+    )
+
+
+check_plugin_unbound_upstream = CheckPlugin(
+    name="unbound_upstream",
+    service_name="Unbound Upstream %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_upstream,
+    check_function=check_unbound_upstream,
+    check_default_parameters={},
+    check_ruleset_name="unbound_upstream",
+)
+
+
+def discover_unbound_query_types(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and instance.qtype:
+            yield Service(item=item)
+
+
+def check_unbound_query_types(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or not instance.qtype:
+        return
+
+    # the query types depend on the traffic, all of them are rated in one pass
+    rates = counter_rates(instance, instance.qtype)
+    total = sum(rates.values())
+    ranked = sorted(rates.items(), key=lambda item: (-item[1], item[0]))
+    if total:
+        yield Result(
+            state=State.OK,
+            summary=f'Most frequent: {ranked[0][0]} ({render.percent(ranked[0][1] * 100.0 / total)})',
+        )
+    else:
+        yield Result(state=State.OK, summary='No queries')
+
+    for qtype, rate in ranked:
+        yield from check_levels(
+            value=rate,
+            levels_upper=params.get(f'levels_upper_{qtype}'),
+            metric_name=f'unbound_qtype_{qtype}',
+            render_func=render_qps,
+            label=qtype,
+            notice_only=True,
+        )
+        yield from check_levels(
+            value=rate * 100.0 / total if total else 0.0,
+            levels_upper=params.get(f'levels_share_{qtype}'),
+            render_func=render.percent,
+            label=f'{qtype} share',
+            notice_only=True,
+        )
+
+
+check_plugin_unbound_query_types = CheckPlugin(
+    name="unbound_query_types",
+    service_name="Unbound Query Types %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_query_types,
+    check_function=check_unbound_query_types,
+    check_default_parameters={},
+    check_ruleset_name="unbound_query_types",
+)
+
+
+UNBOUND_TCP_PROTOCOLS = (
+    # key, metric, label
+    ('num.query.tcp', 'unbound_queries_tcp_rate', 'TCP'),
+    ('num.query.tls', 'unbound_queries_tls_rate', 'TLS'),
+    ('num.query.tls.resume', 'unbound_queries_tls_resume_rate', 'TLS resumed'),
+    ('num.query.https', 'unbound_queries_https_rate', 'HTTPS'),
+)
+
+
+def discover_unbound_tcp_tls(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'tcpusage' in instance.total:
+            yield Service(item=item)
+
+
+def check_unbound_tcp_tls(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'tcpusage' not in instance.total:
+        return
+
+    usage = instance.total['tcpusage']
+    capacity = params['incoming_num_tcp'] * instance.thread_count
+    yield from check_levels(
+        value=usage * 100.0 / capacity,
+        levels_upper=params.get('levels_tcp_usage'),
+        metric_name='unbound_tcp_buffer_utilization',
+        render_func=render.percent,
+        label='TCP buffer usage',
+    )
+    yield Result(state=State.OK, summary=f'{usage} of {capacity} buffers')
+    yield Metric('unbound_tcp_buffers', usage, boundaries=(0, capacity))
+
+    try:
+        rates = counter_rates(instance, {
+            key: instance.misc[key] for key, *_ in UNBOUND_TCP_PROTOCOLS if key in instance.misc
+        })
+    except RatesUnavailable:
+        rates = {}
+
+    for key, metric_name, label in UNBOUND_TCP_PROTOCOLS:
+        if key not in rates:
+            continue
+        yield from check_levels(
+            value=rates[key],
+            metric_name=metric_name,
+            render_func=render_qps,
+            label=label,
+            notice_only=True,
+        )
+
+    # resumed sessions skip the full, CPU-expensive handshake
+    if rates.get('num.query.tls') and 'num.query.tls.resume' in rates:
+        yield from check_levels(
+            value=rates['num.query.tls.resume'] * 100.0 / rates['num.query.tls'],
+            levels_lower=params.get('levels_tls_resume_ratio'),
+            metric_name='unbound_tls_resume_ratio',
+            render_func=render.percent,
+            label='TLS resume ratio',
+            notice_only='levels_tls_resume_ratio' not in params,
+        )
+
+
+check_plugin_unbound_tcp_tls = CheckPlugin(
+    name="unbound_tcp_tls",
+    service_name="Unbound TCP/TLS %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_tcp_tls,
+    check_function=check_unbound_tcp_tls,
+    check_default_parameters={
+        # unbound's default for incoming-num-tcp
+        'incoming_num_tcp': 10,
+        'levels_tcp_usage': ('fixed', (80.0, 90.0)),
+    },
+    check_ruleset_name="unbound_tcp_tls",
+)
+
+
+UNBOUND_RATELIMIT_COUNTERS = (
+    # group, key, parameter, metric, label
+    ('total', 'num.queries_ip_ratelimited', 'levels_ip_ratelimited', 'unbound_ip_ratelimited_rate', 'IP rate limited'),
+    ('misc', 'num.query.ratelimited', 'levels_ratelimited', 'unbound_ratelimited_rate', 'Zone rate limited'),
+    ('total', 'num.queries_cookie_valid', None, 'unbound_cookie_valid_rate', 'Valid cookies'),
+    ('total', 'num.queries_cookie_client', None, 'unbound_cookie_client_rate', 'Client cookies only'),
+    ('total', 'num.queries_cookie_invalid', 'levels_cookie_invalid', 'unbound_cookie_invalid_rate', 'Invalid cookies'),
+)
+
+
+def discover_unbound_ratelimit(section: UnboundInstances) -> DiscoveryResult:
+    for item, instance in section.items():
+        if instance.now is not None and 'num.queries_ip_ratelimited' in instance.total:
+            yield Service(item=item)
+
+
+def check_unbound_ratelimit(
+    item: str,
+    params: Mapping[str, Any],
+    section: UnboundInstances,
+) -> CheckResult:
+    instance = section.get(item)
+    if instance is None:
+        return
+    if instance.is_stale:
+        yield _stale_result(instance)
+        return
+
+    if instance.now is None or 'num.queries_ip_ratelimited' not in instance.total:
+        return
+
+    counters = {}
+    for group, key, *_ in UNBOUND_RATELIMIT_COUNTERS:
+        if key in getattr(instance, group):
+            counters[key] = getattr(instance, group)[key]
+    if 'num.queries' in instance.total:
+        counters['num.queries'] = instance.total['num.queries']
+    rates = counter_rates(instance, counters)
+
+    for _group, key, param, metric_name, label in UNBOUND_RATELIMIT_COUNTERS:
+        if key not in rates:
+            continue
+        yield from check_levels(
+            value=rates[key],
+            levels_upper=params.get(param) if param else None,
+            metric_name=metric_name,
+            render_func=render_qps,
+            label=label,
+            notice_only=param not in params,
+        )
+
+    queries = rates.get('num.queries')
+    if queries is None:
+        return
+    limited = rates['num.queries_ip_ratelimited'] + rates.get('num.query.ratelimited', 0.0)
+    yield from check_levels(
+        value=limited * 100.0 / queries if queries else 0.0,
+        levels_upper=params.get('levels_ratelimited_ratio'),
+        metric_name='unbound_ratelimited_ratio',
+        render_func=render.percent,
+        label='Rate limited queries',
+    )
+    if 'num.queries_cookie_invalid' in rates:
+        yield from check_levels(
+            value=rates['num.queries_cookie_invalid'] * 100.0 / queries if queries else 0.0,
+            levels_upper=params.get('levels_cookie_invalid_ratio'),
+            metric_name='unbound_cookie_invalid_ratio',
+            render_func=render.percent,
+            label='Queries with invalid cookies',
+        )
+
+
+check_plugin_unbound_ratelimit = CheckPlugin(
+    name="unbound_ratelimit",
+    service_name="Unbound Rate Limiting %s",
+    sections=["unbound"],
+    discovery_function=discover_unbound_ratelimit,
+    check_function=check_unbound_ratelimit,
+    check_default_parameters={},
+    check_ruleset_name="unbound_ratelimit",
 )
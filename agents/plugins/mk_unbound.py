@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright (C) 2025, Marius Rieder <marius.rieder@scs.ch>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+"""Checkmk agent plugin for the Unbound DNS server
+
+Alternative to the shell plugin ``unbound`` which speaks the unbound remote
+control protocol directly instead of forking ``unbound-control`` for every
+instance. The connection settings are taken from the ``remote-control:``
+clause of the instance's unbound.conf: a ``control-interface`` starting with
+a ``/`` is used as unix socket, otherwise TLS is used unless
+``control-use-cert`` is disabled.
+
+It reads UNBOUND_INSTANCES, UNBOUND_TIMEOUT, UNBOUND_GROUPS and
+UNBOUND_HISTOGRAM from the same $MK_CONFDIR/unbound.cfg as the shell plugin and produces the same output.
+The asynchronous mode (UNBOUND_ASYNC) is only provided by the shell plugin.
+"""
+
+__version__ = "3.0.0"
+
+import os
+import re
+import shlex
+import socket
+import ssl
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CONFIG = '/etc/unbound/unbound.conf'
+DEFAULT_INTERFACE = '127.0.0.1'
+DEFAULT_PORT = 8953
+DEFAULT_TIMEOUT = 10.0
+
+# Version prefix expected by the unbound remote control before each command
+PROTOCOL_HEADER = b'UBCT1 '
+
+# Optional stat groups, everything else is always reported
+GROUPS = (
+    ('threads', r'^thread[0-9]+[.]'),
+    ('histogram', r'^histogram[.]'),
+    ('qtype', r'^num[.]query[.]type[.]'),
+    ('mem', r'^mem[.]'),
+)
+
+# Percentiles of the recursion times reported by UNBOUND_HISTOGRAM=summary
+PERCENTILES = (50, 90, 95, 99)
+
+
+def read_plugin_config(path):
+    """Read the shell style KEY=value assignments of unbound.cfg"""
+    config = {}
+    try:
+        with open(path) as config_file:
+            lines = config_file.read().splitlines()
+    except IOError:
+        return config
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = line.split('=', 1)
+        config[key.strip()] = ' '.join(shlex.split(value, comments=True))
+    return config
+
+
+def read_remote_control(path):
+    """Read the remote-control clause of an unbound.conf"""
+    options = {}
+    clause = None
+    with open(path) as config_file:
+        for line in config_file:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            key, _, value = line.partition(':')
+            value = value.strip().strip('"')
+            if not value:
+                clause = key.strip()
+            elif clause == 'remote-control':
+                # unbound-control uses the first control-interface
+                options.setdefault(key.strip(), value)
+    return options
+
+
+def connect(config, timeout):
+    options = read_remote_control(config)
+    interface = options.get('control-interface', DEFAULT_INTERFACE)
+
+    if interface.startswith('/'):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(interface)
+        except (OSError, ValueError):
+            sock.close()
+            raise
+        return sock
+
+    port = int(options.get('control-port', DEFAULT_PORT))
+    sock = socket.create_connection((interface, port), timeout)
+    if options.get('control-use-cert', 'yes') == 'no':
+        return sock
+
+    def path(option, default):
+        return os.path.join(os.path.dirname(config), options.get(option, default))
+
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    # The server certificate is self-signed and pinned by server-cert-file,
+    # its name is not checked (same as unbound-control).
+    context.check_hostname = False
+    context.load_verify_locations(path('server-cert-file', 'unbound_server.pem'))
+    context.load_cert_chain(
+        path('control-cert-file', 'unbound_control.pem'),
+        path('control-key-file', 'unbound_control.key'),
+    )
+    try:
+        return context.wrap_socket(sock)
+    except (OSError, ValueError):
+        sock.close()
+        raise
+
+
+def query(config, command, timeout):
+    """Run one remote control command and return the server's reply"""
+    sock = connect(config, timeout)
+    try:
+        sock.sendall(PROTOCOL_HEADER + command.encode('ascii') + b'\n')
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        sock.close()
+    return b''.join(chunks).decode('utf-8', 'replace')
+
+
+def exclude_pattern(groups):
+    """Regular expression of the stats not in the reported groups"""
+    if groups is None:
+        return None
+    patterns = [pattern for group, pattern in GROUPS if group not in groups.split()]
+    return re.compile('|'.join(patterns)) if patterns else None
+
+
+def filter_stats(stats, exclude):
+    """Drop the excluded stats, report the number of threads if their stats are dropped"""
+    if exclude is None:
+        return stats
+    lines = stats.splitlines(True)
+    threads = sum(1 for line in lines if re.match(r'^thread[0-9]+[.]num[.]queries=', line))
+    output = ''.join(line for line in lines if not exclude.search(line))
+    if threads and exclude.search('thread0.num.queries='):
+        output += 'num.threads=%d\n' % threads
+    return output
+
+
+def _histogram_bounds(key):
+    # histogram.000000.000512.to.000000.001024
+    _, lower_s, lower_us, _, upper_s, upper_us = key.split('.')
+    return float('%s.%s' % (lower_s, lower_us)), float('%s.%s' % (upper_s, upper_us))
+
+
+def summarize_histogram(stats, state_path):
+    """Replace the histogram buckets by a summary of the replies since the previous call
+
+    The summary consists of the number of replies, their percentiles and the
+    upper bound of the slowest bucket. The bucket counts are kept in
+    ``state_path`` for the next call.
+    """
+    try:
+        with open(state_path) as state_file:
+            last = dict(line.split('=', 1) for line in state_file.read().splitlines() if '=' in line)
+    except IOError:
+        last = {}
+
+    lines, buckets, now = [], [], ''
+    for line in stats.splitlines(True):
+        key, _, value = line.rstrip('\n').partition('=')
+        if key == 'time.now':
+            now = value
+        if re.match(r'^histogram[.].*[.]to[.]', key):
+            buckets.append((key, int(value)))
+        else:
+            lines.append(line)
+    if not buckets:
+        return stats
+
+    with open(state_path + '.new', 'w') as state_file:
+        state_file.write('time.now=%s\n' % now)
+        state_file.writelines('%s=%d\n' % bucket for bucket in buckets)
+    os.rename(state_path + '.new', state_path)
+
+    deltas = [count - int(last.get(key, 0)) for key, count in buckets]
+    if (
+        not now or not last.get('time.now') or float(now) <= float(last['time.now'])
+        or any(key not in last for key, _count in buckets) or min(deltas) < 0
+    ):
+        return ''.join(lines) + 'histogram.summary.interval=0\n'
+
+    total = sum(deltas)
+    lines.append('histogram.summary.interval=%.6f\n' % (float(now) - float(last['time.now'])))
+    lines.append('histogram.summary.count=%d\n' % total)
+    if not total:
+        return ''.join(lines)
+
+    bounds = [_histogram_bounds(key) for key, _count in buckets]
+    for percentile in PERCENTILES:
+        target = total * percentile / 100.0
+        cumulative = 0
+        value = bounds[-1][1]
+        for (lower, upper), delta in zip(bounds, deltas):
+            if delta and cumulative + delta >= target:
+                value = lower + (upper - lower) * (target - cumulative) / delta
+                break
+            cumulative += delta
+        lines.append('histogram.summary.p%d=%.6f\n' % (percentile, value))
+    slowest = max(index for index, delta in enumerate(deltas) if delta)
+    lines.append('histogram.summary.max=%.6f\n' % bounds[slowest][1])
+    return ''.join(lines)
+
+
+def collect(name, config, timeout, exclude, state_dir):
+    try:
+        stats = query(config, 'stats_noreset', timeout)
+        if state_dir is not None:
+            stats = summarize_histogram(stats, os.path.join(state_dir, 'unbound.%s.histogram' % name))
+        return filter_stats(stats, exclude)
+    except (OSError, ValueError) as exc:
+        sys.stderr.write('unbound: %s: %s\n' % (config, exc))
+        return ''
+
+
+def main():
+    plugin_config = read_plugin_config(
+        os.path.join(os.environ.get('MK_CONFDIR', '/etc/check_mk'), 'unbound.cfg')
+    )
+    timeout = float(plugin_config.get('UNBOUND_TIMEOUT', DEFAULT_TIMEOUT))
+    exclude = exclude_pattern(plugin_config.get('UNBOUND_GROUPS'))
+    state_dir = None
+    if plugin_config.get('UNBOUND_HISTOGRAM') == 'summary':
+        state_dir = os.path.join(os.environ.get('MK_VARDIR', '/var/lib/check_mk_agent'), 'cache')
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir)
+    instances = [
+        (instance.split(':', 1)[0], instance.split(':', 1)[-1])
+        for instance in plugin_config.get('UNBOUND_INSTANCES', '').split()
+    ]
+
+    sys.stdout.write('<<<unbound:sep(61)>>>\n')
+    if not instances:
+        sys.stdout.write(collect('default', DEFAULT_CONFIG, timeout, exclude, state_dir))
+    else:
+        with ThreadPoolExecutor(len(instances)) as executor:
+            outputs = list(executor.map(
+                lambda instance: collect(instance[0], instance[1], timeout, exclude, state_dir),
+                instances,
+            ))
+        for (name, _config), output in zip(instances, outputs):
+            sys.stdout.write('[[[%s]]]\n' % name)
+            sys.stdout.write(output)
+    sys.stdout.write('<<<>>>\n')
+
+
+if __name__ == '__main__':
+    main()
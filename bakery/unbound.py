@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+
+# Copyright (C) 2025, Marius Rieder <marius.rieder@scs.ch>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+import math
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .bakery_api.v1 import (
+    FileGenerator,
+    OS,
+    Plugin,
+    PluginConfig,
+    register,
+)
+
+
+def get_unbound_config_lines(conf: Dict[str, Any]) -> List[str]:
+    lines = []
+    if conf.get('instances'):
+        instances = ' '.join(f"{instance['name']}:{instance['config']}" for instance in conf['instances'])
+        lines.append(f'UNBOUND_INSTANCES="{instances}"')
+    if 'timeout' in conf:
+        # timeout 0 would disable the timeout of the shell plugin
+        lines.append(f"UNBOUND_TIMEOUT={max(1, math.ceil(conf['timeout']))}")
+    # the asynchronous mode is only provided by the shell plugin
+    if 'cache' in conf and conf.get('plugin', 'unbound') == 'unbound':
+        lines.append('UNBOUND_ASYNC=yes')
+        lines.append(f"UNBOUND_MAX_AGE={int(conf['cache']['max_age'])}")
+    if 'groups' in conf:
+        lines.append(f"UNBOUND_GROUPS=\"{' '.join(conf['groups'])}\"")
+    if conf.get('histogram_summary'):
+        lines.append('UNBOUND_HISTOGRAM=summary')
+    return lines
+
+
+def get_unbound_files(conf: Dict[str, Any]) -> FileGenerator:
+    yield Plugin(
+        base_os=OS.LINUX,
+        source=Path(conf.get('plugin', 'unbound')),
+        interval=int(conf['interval']) if 'interval' in conf else None,
+    )
+    yield PluginConfig(
+        base_os=OS.LINUX,
+        lines=get_unbound_config_lines(conf),
+        target=Path('unbound.cfg'),
+        include_header=True,
+    )
+
+
+register.bakery_plugin(
+    name='unbound',
+    files_function=get_unbound_files,
+)
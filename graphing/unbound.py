@@ -69,13 +69,83 @@ metric_unbound_answers_nodata = metrics.Metric(
     color=metrics.Color.DARK_BROWN,
 )
 
+metric_unbound_answers_rate = metrics.Metric(
+    name='unbound_answers_rate',
+    title=Title('Rate of answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLACK,
+)
+
 graph_unbound_answers = graphs.Graph(
     name='unbound_answers',
     title=Title('Rate of answers'),
-    simple_lines=[
+    # nodata answers are also counted as NOERROR
+    compound_lines=[
         f'unbound_answers_{answer}'
-        for answer in ('NOERROR', 'FORMERR', 'SERVFAIL', 'NXDOMAIN', 'NOTIMPL', 'REFUSED', 'nodata')
+        for answer in ('NOERROR', 'FORMERR', 'SERVFAIL', 'NXDOMAIN', 'NOTIMPL', 'REFUSED')
+    ],
+    simple_lines=['unbound_answers_rate', 'unbound_answers_nodata'],
+    optional=['unbound_answers_rate'],
+)
+
+metric_unbound_answers_NOERROR_ratio = metrics.Metric(
+    name='unbound_answers_NOERROR_ratio',
+    title=Title('Share of NOERROR answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_answers_FORMERR_ratio = metrics.Metric(
+    name='unbound_answers_FORMERR_ratio',
+    title=Title('Share of FORMERR answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.DARK_YELLOW,
+)
+
+metric_unbound_answers_SERVFAIL_ratio = metrics.Metric(
+    name='unbound_answers_SERVFAIL_ratio',
+    title=Title('Share of SERVFAIL answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.DARK_PURPLE,
+)
+
+metric_unbound_answers_NXDOMAIN_ratio = metrics.Metric(
+    name='unbound_answers_NXDOMAIN_ratio',
+    title=Title('Share of NXDOMAIN answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GRAY,
+)
+
+metric_unbound_answers_NOTIMPL_ratio = metrics.Metric(
+    name='unbound_answers_NOTIMPL_ratio',
+    title=Title('Share of NOTIMPL answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.DARK_BLUE,
+)
+
+metric_unbound_answers_REFUSED_ratio = metrics.Metric(
+    name='unbound_answers_REFUSED_ratio',
+    title=Title('Share of REFUSED answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_answers_nodata_ratio = metrics.Metric(
+    name='unbound_answers_nodata_ratio',
+    title=Title('Share of answers without data'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.DARK_BROWN,
+)
+
+graph_unbound_answers_ratio = graphs.Graph(
+    name='unbound_answers_ratio',
+    title=Title('Share of answers'),
+    compound_lines=[
+        f'unbound_answers_{answer}_ratio'
+        for answer in ('NOERROR', 'FORMERR', 'SERVFAIL', 'NXDOMAIN', 'NOTIMPL', 'REFUSED')
     ],
+    simple_lines=['unbound_answers_nodata_ratio'],
+    minimal_range=graphs.MinimalRange(0, 100),
 )
 
 metric_cache_hit_rate = metrics.Metric(
@@ -100,3 +170,974 @@ graph_cache_hit_misses = graphs.Graph(
         'cache_misses_rate',
     ],
 )
+
+metric_unbound_recursion_latency_p50 = metrics.Metric(
+    name='unbound_recursion_latency_p50',
+    title=Title('Recursion latency 50th percentile'),
+    unit=metrics.Unit(metrics.TimeNotation()),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_recursion_latency_p90 = metrics.Metric(
+    name='unbound_recursion_latency_p90',
+    title=Title('Recursion latency 90th percentile'),
+    unit=metrics.Unit(metrics.TimeNotation()),
+    color=metrics.Color.YELLOW,
+)
+
+metric_unbound_recursion_latency_p95 = metrics.Metric(
+    name='unbound_recursion_latency_p95',
+    title=Title('Recursion latency 95th percentile'),
+    unit=metrics.Unit(metrics.TimeNotation()),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_recursion_latency_p99 = metrics.Metric(
+    name='unbound_recursion_latency_p99',
+    title=Title('Recursion latency 99th percentile'),
+    unit=metrics.Unit(metrics.TimeNotation()),
+    color=metrics.Color.RED,
+)
+
+graph_unbound_recursion_latency = graphs.Graph(
+    name='unbound_recursion_latency',
+    title=Title('Recursion latency percentiles'),
+    simple_lines=[
+        f'unbound_recursion_latency_p{percentile}'
+        for percentile in (50, 90, 95, 99)
+    ],
+)
+
+metric_unbound_threads_imbalance = metrics.Metric(
+    name='unbound_threads_imbalance',
+    title=Title('Thread load imbalance (max/mean)'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_cluster_imbalance = metrics.Metric(
+    name='unbound_cluster_imbalance',
+    title=Title('Cluster node traffic imbalance (max/mean)'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_threads_max_queries_rate = metrics.Metric(
+    name='unbound_threads_max_queries_rate',
+    title=Title('Queries per second of the hottest thread'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_threads_mean_queries_rate = metrics.Metric(
+    name='unbound_threads_mean_queries_rate',
+    title=Title('Mean queries per second per thread'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+graph_unbound_threads_queries = graphs.Graph(
+    name='unbound_threads_queries',
+    title=Title('Queries per thread'),
+    simple_lines=[
+        'unbound_threads_max_queries_rate',
+        'unbound_threads_mean_queries_rate',
+    ],
+)
+
+metric_unbound_mem_cache_rrset = metrics.Metric(
+    name='unbound_mem_cache_rrset',
+    title=Title('Memory used by the RRset cache'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_mem_cache_message = metrics.Metric(
+    name='unbound_mem_cache_message',
+    title=Title('Memory used by the message cache'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_mem_mod_iterator = metrics.Metric(
+    name='unbound_mem_mod_iterator',
+    title=Title('Memory used by the iterator module'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_mem_mod_validator = metrics.Metric(
+    name='unbound_mem_mod_validator',
+    title=Title('Memory used by the validator module'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_mem_mod_respip = metrics.Metric(
+    name='unbound_mem_mod_respip',
+    title=Title('Memory used by the response IP module'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.YELLOW,
+)
+
+metric_unbound_mem_mod_subnet = metrics.Metric(
+    name='unbound_mem_mod_subnet',
+    title=Title('Memory used by the subnet module'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.CYAN,
+)
+
+metric_unbound_mem_streamwait = metrics.Metric(
+    name='unbound_mem_streamwait',
+    title=Title('Memory used by the TCP stream wait buffers'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.BROWN,
+)
+
+metric_unbound_mem_http_query_buffer = metrics.Metric(
+    name='unbound_mem_http_query_buffer',
+    title=Title('Memory used by the HTTP query buffers'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.PINK,
+)
+
+metric_unbound_mem_http_response_buffer = metrics.Metric(
+    name='unbound_mem_http_response_buffer',
+    title=Title('Memory used by the HTTP response buffers'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.GRAY,
+)
+
+metric_unbound_mem_total = metrics.Metric(
+    name='unbound_mem_total',
+    title=Title('Total memory'),
+    unit=metrics.Unit(metrics.IECNotation("B")),
+    color=metrics.Color.DARK_BLUE,
+)
+
+graph_unbound_memory = graphs.Graph(
+    name='unbound_memory',
+    title=Title('Memory usage'),
+    compound_lines=[
+        f'unbound_mem_{component}'
+        for component in (
+            'cache_rrset',
+            'cache_message',
+            'mod_iterator',
+            'mod_validator',
+            'mod_respip',
+            'mod_subnet',
+            'streamwait',
+            'http_query_buffer',
+            'http_response_buffer',
+        )
+    ],
+    simple_lines=['unbound_mem_total'],
+    # depend on the unbound version and build options
+    optional=[
+        f'unbound_mem_{component}'
+        for component in (
+            'mod_respip',
+            'mod_subnet',
+            'streamwait',
+            'http_query_buffer',
+            'http_response_buffer',
+        )
+    ],
+)
+
+metric_unbound_mem_cache_message_fill = metrics.Metric(
+    name='unbound_mem_cache_message_fill',
+    title=Title('Message cache fill'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_mem_cache_rrset_fill = metrics.Metric(
+    name='unbound_mem_cache_rrset_fill',
+    title=Title('RRset cache fill'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GREEN,
+)
+
+graph_unbound_cache_fill = graphs.Graph(
+    name='unbound_cache_fill',
+    title=Title('Cache fill'),
+    simple_lines=[
+        'unbound_mem_cache_message_fill',
+        'unbound_mem_cache_rrset_fill',
+    ],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+metric_unbound_mem_cache_message_growth = metrics.Metric(
+    name='unbound_mem_cache_message_growth',
+    title=Title('Message cache growth'),
+    unit=metrics.Unit(metrics.IECNotation("B/s")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_mem_cache_rrset_growth = metrics.Metric(
+    name='unbound_mem_cache_rrset_growth',
+    title=Title('RRset cache growth'),
+    unit=metrics.Unit(metrics.IECNotation("B/s")),
+    color=metrics.Color.GREEN,
+)
+
+graph_unbound_cache_growth = graphs.Graph(
+    name='unbound_cache_growth',
+    title=Title('Cache growth'),
+    simple_lines=[
+        'unbound_mem_cache_message_growth',
+        'unbound_mem_cache_rrset_growth',
+    ],
+)
+
+metric_unbound_requestlist_utilization = metrics.Metric(
+    name='unbound_requestlist_utilization',
+    title=Title('Request list utilization'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_requestlist_current = metrics.Metric(
+    name='unbound_requestlist_current',
+    title=Title('Requests in the request list'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.CYAN,
+)
+
+metric_unbound_requestlist_exceeded = metrics.Metric(
+    name='unbound_requestlist_exceeded',
+    title=Title('Rate of queries dropped because the request list was full'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_requestlist_overwritten = metrics.Metric(
+    name='unbound_requestlist_overwritten',
+    title=Title('Rate of requests overwritten by newer requests'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_queries_timed_out = metrics.Metric(
+    name='unbound_queries_timed_out',
+    title=Title('Rate of queries timed out in the request queue'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_queue_time_max = metrics.Metric(
+    name='unbound_queue_time_max',
+    title=Title('Maximum queue time'),
+    unit=metrics.Unit(metrics.TimeNotation()),
+    color=metrics.Color.DARK_BLUE,
+)
+
+graph_unbound_requestlist_utilization = graphs.Graph(
+    name='unbound_requestlist_utilization',
+    title=Title('Request list utilization'),
+    simple_lines=['unbound_requestlist_utilization'],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+graph_unbound_requestlist_drops = graphs.Graph(
+    name='unbound_requestlist_drops',
+    title=Title('Dropped and timed out requests'),
+    compound_lines=[
+        'unbound_requestlist_exceeded',
+        'unbound_requestlist_overwritten',
+        'unbound_queries_timed_out',
+    ],
+)
+
+metric_unbound_queries_rate = metrics.Metric(
+    name='unbound_queries_rate',
+    title=Title('Queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_queries_tcp_rate = metrics.Metric(
+    name='unbound_queries_tcp_rate',
+    title=Title('TCP queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_queries_tls_rate = metrics.Metric(
+    name='unbound_queries_tls_rate',
+    title=Title('TLS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_queries_https_rate = metrics.Metric(
+    name='unbound_queries_https_rate',
+    title=Title('HTTPS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_queries_ipv6_rate = metrics.Metric(
+    name='unbound_queries_ipv6_rate',
+    title=Title('IPv6 queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.CYAN,
+)
+
+graph_unbound_queries = graphs.Graph(
+    name='unbound_queries',
+    title=Title('Queries per second'),
+    simple_lines=[
+        'unbound_queries_rate',
+        'unbound_queries_tcp_rate',
+        'unbound_queries_tls_rate',
+        'unbound_queries_https_rate',
+        'unbound_queries_ipv6_rate',
+    ],
+    # only reported by unbound versions and builds supporting the transport
+    optional=[
+        'unbound_queries_tcp_rate',
+        'unbound_queries_tls_rate',
+        'unbound_queries_https_rate',
+        'unbound_queries_ipv6_rate',
+    ],
+)
+
+metric_unbound_prefetch_rate = metrics.Metric(
+    name='unbound_prefetch_rate',
+    title=Title('Prefetches per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_expired_rate = metrics.Metric(
+    name='unbound_expired_rate',
+    title=Title('Expired answers per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_recursive_replies_rate = metrics.Metric(
+    name='unbound_recursive_replies_rate',
+    title=Title('Recursive replies per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_prefetch_ratio = metrics.Metric(
+    name='unbound_prefetch_ratio',
+    title=Title('Prefetches of cache hits'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_expired_ratio = metrics.Metric(
+    name='unbound_expired_ratio',
+    title=Title('Expired answers of queries'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.ORANGE,
+)
+
+graph_unbound_prefetch = graphs.Graph(
+    name='unbound_prefetch',
+    title=Title('Prefetches and expired answers'),
+    simple_lines=[
+        'unbound_prefetch_rate',
+        'unbound_expired_rate',
+        'unbound_recursive_replies_rate',
+    ],
+)
+
+graph_unbound_prefetch_ratio = graphs.Graph(
+    name='unbound_prefetch_ratio',
+    title=Title('Prefetch and expired answer ratios'),
+    simple_lines=[
+        'unbound_prefetch_ratio',
+        'unbound_expired_ratio',
+    ],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+metric_unbound_answers_secure_rate = metrics.Metric(
+    name='unbound_answers_secure_rate',
+    title=Title('Secure answers per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_answers_bogus_rate = metrics.Metric(
+    name='unbound_answers_bogus_rate',
+    title=Title('Bogus answers per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_rrset_bogus_rate = metrics.Metric(
+    name='unbound_rrset_bogus_rate',
+    title=Title('Bogus RRsets per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_answers_bogus_ratio = metrics.Metric(
+    name='unbound_answers_bogus_ratio',
+    title=Title('Bogus of all answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_answers_secure_ratio = metrics.Metric(
+    name='unbound_answers_secure_ratio',
+    title=Title('Secure of all answers'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GREEN,
+)
+
+graph_unbound_dnssec = graphs.Graph(
+    name='unbound_dnssec',
+    title=Title('DNSSEC validation'),
+    simple_lines=[
+        'unbound_answers_secure_rate',
+        'unbound_answers_bogus_rate',
+        'unbound_rrset_bogus_rate',
+    ],
+)
+
+graph_unbound_dnssec_ratio = graphs.Graph(
+    name='unbound_dnssec_ratio',
+    title=Title('DNSSEC validation ratios'),
+    simple_lines=[
+        'unbound_answers_secure_ratio',
+        'unbound_answers_bogus_ratio',
+    ],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+metric_unbound_cache_msg_entries = metrics.Metric(
+    name='unbound_cache_msg_entries',
+    title=Title('Message cache entries'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_cache_rrset_entries = metrics.Metric(
+    name='unbound_cache_rrset_entries',
+    title=Title('RRset cache entries'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cache_infra_entries = metrics.Metric(
+    name='unbound_cache_infra_entries',
+    title=Title('Infrastructure cache entries'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_cache_key_entries = metrics.Metric(
+    name='unbound_cache_key_entries',
+    title=Title('Key cache entries'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_cache_msg_collisions = metrics.Metric(
+    name='unbound_cache_msg_collisions',
+    title=Title('Message cache max collisions'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_cache_rrset_collisions = metrics.Metric(
+    name='unbound_cache_rrset_collisions',
+    title=Title('RRset cache max collisions'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cache_msg_growth = metrics.Metric(
+    name='unbound_cache_msg_growth',
+    title=Title('Message cache entry growth'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_cache_rrset_growth = metrics.Metric(
+    name='unbound_cache_rrset_growth',
+    title=Title('RRset cache entry growth'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cache_infra_growth = metrics.Metric(
+    name='unbound_cache_infra_growth',
+    title=Title('Infrastructure cache entry growth'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_cache_key_growth = metrics.Metric(
+    name='unbound_cache_key_growth',
+    title=Title('Key cache entry growth'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+graph_unbound_cache_entries = graphs.Graph(
+    name='unbound_cache_entries',
+    title=Title('Cache entries'),
+    simple_lines=[
+        'unbound_cache_msg_entries',
+        'unbound_cache_rrset_entries',
+        'unbound_cache_infra_entries',
+        'unbound_cache_key_entries',
+    ],
+    # the Unbound Cache service only reports the msg and rrset entries
+    optional=[
+        'unbound_cache_infra_entries',
+        'unbound_cache_key_entries',
+    ],
+)
+
+graph_unbound_cache_collisions = graphs.Graph(
+    name='unbound_cache_collisions',
+    title=Title('Cache hash table max collisions'),
+    simple_lines=[
+        'unbound_cache_msg_collisions',
+        'unbound_cache_rrset_collisions',
+    ],
+    # only reported by newer unbound versions
+    optional=[
+        'unbound_cache_msg_collisions',
+        'unbound_cache_rrset_collisions',
+    ],
+)
+
+graph_unbound_cache_entry_growth = graphs.Graph(
+    name='unbound_cache_entry_growth',
+    title=Title('Cache entry growth'),
+    simple_lines=[
+        'unbound_cache_msg_growth',
+        'unbound_cache_rrset_growth',
+        'unbound_cache_infra_growth',
+        'unbound_cache_key_growth',
+    ],
+    # the key cache only exists with the validator module
+    optional=[
+        'unbound_cache_infra_growth',
+        'unbound_cache_key_growth',
+    ],
+)
+
+metric_unbound_subnet_rate = metrics.Metric(
+    name='unbound_subnet_rate',
+    title=Title('ECS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_subnet_cache_rate = metrics.Metric(
+    name='unbound_subnet_cache_rate',
+    title=Title('ECS cache hits per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cachedb_rate = metrics.Metric(
+    name='unbound_cachedb_rate',
+    title=Title('Cachedb hits per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_subnet_hit_ratio = metrics.Metric(
+    name='unbound_subnet_hit_ratio',
+    title=Title('ECS cache hit ratio'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cachedb_hit_ratio = metrics.Metric(
+    name='unbound_cachedb_hit_ratio',
+    title=Title('Cachedb hit ratio'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.ORANGE,
+)
+
+graph_unbound_ecs_cachedb = graphs.Graph(
+    name='unbound_ecs_cachedb',
+    title=Title('ECS and cachedb'),
+    simple_lines=[
+        'unbound_subnet_rate',
+        'unbound_subnet_cache_rate',
+        'unbound_cachedb_rate',
+    ],
+    # unbound may be built with either module
+    optional=[
+        'unbound_subnet_rate',
+        'unbound_subnet_cache_rate',
+        'unbound_cachedb_rate',
+    ],
+)
+
+graph_unbound_ecs_cachedb_hit_ratio = graphs.Graph(
+    name='unbound_ecs_cachedb_hit_ratio',
+    title=Title('ECS and cachedb hit ratios'),
+    simple_lines=[
+        'unbound_subnet_hit_ratio',
+        'unbound_cachedb_hit_ratio',
+    ],
+    optional=[
+        'unbound_subnet_hit_ratio',
+        'unbound_cachedb_hit_ratio',
+    ],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+metric_unbound_upstream_rate = metrics.Metric(
+    name='unbound_upstream_rate',
+    title=Title('Outgoing queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_upstream_udp_rate = metrics.Metric(
+    name='unbound_upstream_udp_rate',
+    title=Title('Outgoing UDP queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_upstream_tcp_rate = metrics.Metric(
+    name='unbound_upstream_tcp_rate',
+    title=Title('Outgoing TCP queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_upstream_amplification = metrics.Metric(
+    name='unbound_upstream_amplification',
+    title=Title('Outgoing queries per recursive reply'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_upstream_per_query = metrics.Metric(
+    name='unbound_upstream_per_query',
+    title=Title('Outgoing queries per client query'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_upstream_tcp_share = metrics.Metric(
+    name='unbound_upstream_tcp_share',
+    title=Title('TCP share of outgoing queries'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.ORANGE,
+)
+
+graph_unbound_upstream = graphs.Graph(
+    name='unbound_upstream',
+    title=Title('Outgoing queries'),
+    compound_lines=[
+        'unbound_upstream_udp_rate',
+        'unbound_upstream_tcp_rate',
+    ],
+    simple_lines=['unbound_upstream_rate'],
+)
+
+graph_unbound_upstream_amplification = graphs.Graph(
+    name='unbound_upstream_amplification',
+    title=Title('Upstream amplification'),
+    simple_lines=[
+        'unbound_upstream_amplification',
+        'unbound_upstream_per_query',
+    ],
+)
+
+# Common query types, other types are graphed generically
+metric_unbound_qtype_A = metrics.Metric(
+    name='unbound_qtype_A',
+    title=Title('A queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_qtype_AAAA = metrics.Metric(
+    name='unbound_qtype_AAAA',
+    title=Title('AAAA queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.LIGHT_BLUE,
+)
+
+metric_unbound_qtype_CNAME = metrics.Metric(
+    name='unbound_qtype_CNAME',
+    title=Title('CNAME queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.CYAN,
+)
+
+metric_unbound_qtype_PTR = metrics.Metric(
+    name='unbound_qtype_PTR',
+    title=Title('PTR queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_qtype_MX = metrics.Metric(
+    name='unbound_qtype_MX',
+    title=Title('MX queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.LIGHT_GREEN,
+)
+
+metric_unbound_qtype_NS = metrics.Metric(
+    name='unbound_qtype_NS',
+    title=Title('NS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.DARK_GREEN,
+)
+
+metric_unbound_qtype_SOA = metrics.Metric(
+    name='unbound_qtype_SOA',
+    title=Title('SOA queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.YELLOW,
+)
+
+metric_unbound_qtype_SRV = metrics.Metric(
+    name='unbound_qtype_SRV',
+    title=Title('SRV queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.LIGHT_YELLOW,
+)
+
+metric_unbound_qtype_HTTPS = metrics.Metric(
+    name='unbound_qtype_HTTPS',
+    title=Title('HTTPS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.PURPLE,
+)
+
+metric_unbound_qtype_SVCB = metrics.Metric(
+    name='unbound_qtype_SVCB',
+    title=Title('SVCB queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.LIGHT_PURPLE,
+)
+
+metric_unbound_qtype_DS = metrics.Metric(
+    name='unbound_qtype_DS',
+    title=Title('DS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.BROWN,
+)
+
+metric_unbound_qtype_DNSKEY = metrics.Metric(
+    name='unbound_qtype_DNSKEY',
+    title=Title('DNSKEY queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.DARK_BROWN,
+)
+
+metric_unbound_qtype_TXT = metrics.Metric(
+    name='unbound_qtype_TXT',
+    title=Title('TXT queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_qtype_ANY = metrics.Metric(
+    name='unbound_qtype_ANY',
+    title=Title('ANY queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_qtype_other = metrics.Metric(
+    name='unbound_qtype_other',
+    title=Title('other queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GRAY,
+)
+
+graph_unbound_query_types = graphs.Graph(
+    name='unbound_query_types',
+    title=Title('Queries by type'),
+    compound_lines=[
+        'unbound_qtype_A',
+        'unbound_qtype_AAAA',
+        'unbound_qtype_CNAME',
+        'unbound_qtype_PTR',
+        'unbound_qtype_MX',
+        'unbound_qtype_NS',
+        'unbound_qtype_SOA',
+        'unbound_qtype_SRV',
+        'unbound_qtype_HTTPS',
+        'unbound_qtype_SVCB',
+        'unbound_qtype_DS',
+        'unbound_qtype_DNSKEY',
+        'unbound_qtype_TXT',
+        'unbound_qtype_ANY',
+        'unbound_qtype_other',
+    ],
+    # the query types depend on the traffic
+    optional=[
+        'unbound_qtype_AAAA',
+        'unbound_qtype_CNAME',
+        'unbound_qtype_PTR',
+        'unbound_qtype_MX',
+        'unbound_qtype_NS',
+        'unbound_qtype_SOA',
+        'unbound_qtype_SRV',
+        'unbound_qtype_HTTPS',
+        'unbound_qtype_SVCB',
+        'unbound_qtype_DS',
+        'unbound_qtype_DNSKEY',
+        'unbound_qtype_TXT',
+        'unbound_qtype_ANY',
+        'unbound_qtype_other',
+    ],
+)
+
+metric_unbound_tcp_buffer_utilization = metrics.Metric(
+    name='unbound_tcp_buffer_utilization',
+    title=Title('TCP buffer usage'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.BLUE,
+)
+
+metric_unbound_tcp_buffers = metrics.Metric(
+    name='unbound_tcp_buffers',
+    title=Title('TCP buffers in use'),
+    unit=metrics.Unit(metrics.DecimalNotation(""), metrics.StrictPrecision(0)),
+    color=metrics.Color.CYAN,
+)
+
+metric_unbound_queries_tls_resume_rate = metrics.Metric(
+    name='unbound_queries_tls_resume_rate',
+    title=Title('Resumed TLS queries per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.YELLOW,
+)
+
+metric_unbound_tls_resume_ratio = metrics.Metric(
+    name='unbound_tls_resume_ratio',
+    title=Title('Resumed TLS queries'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.GREEN,
+)
+
+graph_unbound_tcp_buffer_utilization = graphs.Graph(
+    name='unbound_tcp_buffer_utilization',
+    title=Title('TCP buffer usage'),
+    simple_lines=['unbound_tcp_buffer_utilization'],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+graph_unbound_tcp_tls_queries = graphs.Graph(
+    name='unbound_tcp_tls_queries',
+    title=Title('TCP, TLS and HTTPS queries'),
+    simple_lines=[
+        'unbound_queries_tcp_rate',
+        'unbound_queries_tls_rate',
+        'unbound_queries_tls_resume_rate',
+        'unbound_queries_https_rate',
+    ],
+    # TLS session resumption and DoH depend on the unbound version and build
+    optional=[
+        'unbound_queries_tls_resume_rate',
+        'unbound_queries_https_rate',
+    ],
+    conflicting=['unbound_queries_rate'],
+)
+
+graph_unbound_tls_resume_ratio = graphs.Graph(
+    name='unbound_tls_resume_ratio',
+    title=Title('Resumed TLS queries'),
+    simple_lines=['unbound_tls_resume_ratio'],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
+
+metric_unbound_ip_ratelimited_rate = metrics.Metric(
+    name='unbound_ip_ratelimited_rate',
+    title=Title('Queries dropped by ip-ratelimit per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_ratelimited_rate = metrics.Metric(
+    name='unbound_ratelimited_rate',
+    title=Title('Queries dropped by ratelimit per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_cookie_valid_rate = metrics.Metric(
+    name='unbound_cookie_valid_rate',
+    title=Title('Queries with valid DNS cookies per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.GREEN,
+)
+
+metric_unbound_cookie_client_rate = metrics.Metric(
+    name='unbound_cookie_client_rate',
+    title=Title('Queries with client DNS cookies only per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.YELLOW,
+)
+
+metric_unbound_cookie_invalid_rate = metrics.Metric(
+    name='unbound_cookie_invalid_rate',
+    title=Title('Queries with invalid DNS cookies per second'),
+    unit=metrics.Unit(metrics.DecimalNotation("1/s"), metrics.StrictPrecision(2)),
+    color=metrics.Color.RED,
+)
+
+metric_unbound_ratelimited_ratio = metrics.Metric(
+    name='unbound_ratelimited_ratio',
+    title=Title('Rate limited queries'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.ORANGE,
+)
+
+metric_unbound_cookie_invalid_ratio = metrics.Metric(
+    name='unbound_cookie_invalid_ratio',
+    title=Title('Queries with invalid DNS cookies'),
+    unit=metrics.Unit(metrics.DecimalNotation("%")),
+    color=metrics.Color.RED,
+)
+
+graph_unbound_ratelimited = graphs.Graph(
+    name='unbound_ratelimited',
+    title=Title('Rate limited queries'),
+    compound_lines=[
+        'unbound_ip_ratelimited_rate',
+        'unbound_ratelimited_rate',
+    ],
+    optional=['unbound_ratelimited_rate'],
+)
+
+graph_unbound_cookies = graphs.Graph(
+    name='unbound_cookies',
+    title=Title('Queries by DNS cookie'),
+    compound_lines=[
+        'unbound_cookie_valid_rate',
+        'unbound_cookie_client_rate',
+        'unbound_cookie_invalid_rate',
+    ],
+)
+
+graph_unbound_ratelimit_ratio = graphs.Graph(
+    name='unbound_ratelimit_ratio',
+    title=Title('Shed queries'),
+    simple_lines=[
+        'unbound_ratelimited_ratio',
+        'unbound_cookie_invalid_ratio',
+    ],
+    optional=['unbound_cookie_invalid_ratio'],
+    minimal_range=graphs.MinimalRange(0, 100),
+)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (C) 2025, Marius Rieder <marius.rieder@scs.ch>.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
+
+from cmk.rulesets.v1 import Help, Label, Message, Title
+from cmk.rulesets.v1.form_specs import (
+    BooleanChoice,
+    DefaultValue,
+    DictElement,
+    Dictionary,
+    List,
+    MultipleChoice,
+    MultipleChoiceElement,
+    SingleChoice,
+    SingleChoiceElement,
+    String,
+    TimeMagnitude,
+    TimeSpan,
+    validators,
+)
+from cmk.rulesets.v1.rule_specs import AgentConfig, Topic
+
+
+def _parameter_form_unbound_bakery():
+    return Dictionary(
+        title=Title('Unbound'),
+        help_text=Help('This will deploy the agent plugin for the Unbound DNS server.'),
+        elements={
+            'plugin': DictElement(
+                parameter_form=SingleChoice(
+                    title=Title('Agent plugin'),
+                    elements=[
+                        SingleChoiceElement(
+                            name='unbound',
+                            title=Title('Shell plugin using unbound-control'),
+                        ),
+                        SingleChoiceElement(
+                            name='mk_unbound.py',
+                            title=Title('Python plugin using the unbound remote control protocol'),
+                        ),
+                    ],
+                    prefill=DefaultValue('unbound'),
+                ),
+                required=True,
+            ),
+            'interval': DictElement(
+                parameter_form=TimeSpan(
+                    title=Title('Run asynchronously'),
+                    help_text=Help('Collection interval of the agent plugin.'),
+                    displayed_magnitudes=[TimeMagnitude.MINUTE, TimeMagnitude.SECOND],
+                    prefill=DefaultValue(60.0),
+                ),
+            ),
+            'instances': DictElement(
+                parameter_form=List(
+                    title=Title('Instances'),
+                    help_text=Help(
+                        'Without instances the stats of the default unbound instance are reported. '
+                        'The instances are queried concurrently and discovered as separate items.'
+                    ),
+                    element_template=Dictionary(
+                        elements={
+                            'name': DictElement(
+                                parameter_form=String(
+                                    title=Title('Name'),
+                                    custom_validate=(
+                                        validators.MatchRegex(
+                                            regex=r'^[\w.-]+$',
+                                            error_msg=Message('Only letters, digits, ".", "-" and "_" are allowed.'),
+                                        ),
+                                    ),
+                                ),
+                                required=True,
+                            ),
+                            'config': DictElement(
+                                parameter_form=String(
+                                    title=Title('Path to unbound.conf'),
+                                    prefill=DefaultValue('/etc/unbound/unbound.conf'),
+                                    custom_validate=(validators.LengthInRange(min_value=1),),
+                                ),
+                                required=True,
+                            ),
+                        },
+                    ),
+                ),
+            ),
+            'timeout': DictElement(
+                parameter_form=TimeSpan(
+                    title=Title('Timeout for a single instance'),
+                    displayed_magnitudes=[TimeMagnitude.SECOND],
+                    prefill=DefaultValue(10.0),
+                    custom_validate=(validators.NumberInRange(min_value=1.0),),
+                ),
+            ),
+            'cache': DictElement(
+                parameter_form=Dictionary(
+                    title=Title('Collect in the background'),
+                    help_text=Help(
+                        'Report the last good snapshot from a cache which is refreshed in the background, '
+                        'so a busy unbound never stalls the agent. Only supported by the shell plugin, '
+                        'the Python plugin always collects on demand.'
+                    ),
+                    elements={
+                        'max_age': DictElement(
+                            parameter_form=TimeSpan(
+                                title=Title('Report snapshots as stale after'),
+                                displayed_magnitudes=[TimeMagnitude.MINUTE, TimeMagnitude.SECOND],
+                                prefill=DefaultValue(300.0),
+                            ),
+                            required=True,
+                        ),
+                    },
+                ),
+            ),
+            'groups': DictElement(
+                parameter_form=MultipleChoice(
+                    title=Title('Stat groups to report in addition to the totals'),
+                    help_text=Help(
+                        'Leave out groups no service needs to shrink the agent output. '
+                        'The per-thread stats are used by the Unbound Threads service, the histogram by '
+                        'Unbound Recursion Latency, the query types by Unbound Query Types and the memory stats by '
+                        'Unbound Memory and Unbound ECS and Cachedb. The totals, including the query flags, '
+                        'are always reported.'
+                    ),
+                    elements=[
+                        MultipleChoiceElement(name='threads', title=Title('Per-thread stats')),
+                        MultipleChoiceElement(name='histogram', title=Title('Recursion time histogram')),
+                        MultipleChoiceElement(name='qtype', title=Title('Query types')),
+                        MultipleChoiceElement(name='mem', title=Title('Memory')),
+                    ],
+                    prefill=DefaultValue(['threads', 'histogram', 'qtype', 'mem']),
+                ),
+            ),
+            'histogram_summary': DictElement(
+                parameter_form=BooleanChoice(
+                    title=Title('Summarize the recursion time histogram on the host'),
+                    label=Label('Report the percentiles since the previous run instead of the histogram buckets'),
+                    help_text=Help(
+                        'The plugin keeps the previous bucket counts in its cache directory and reports only the '
+                        'number of replies, their percentiles and the slowest bucket for Unbound Recursion Latency.'
+                    ),
+                    prefill=DefaultValue(False),
+                ),
+            ),
+        },
+    )
+
+
+rule_spec_unbound_bakery = AgentConfig(
+    name='unbound',
+    title=Title('Unbound'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_bakery,
+)
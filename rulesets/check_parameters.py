@@ -18,21 +18,62 @@
 # with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301 USA.
 
-from cmk.rulesets.v1 import Title
+from cmk.rulesets.v1 import Help, Title
 from cmk.rulesets.v1.form_specs import (
+    DataSize,
     DefaultValue,
     DictElement,
     Dictionary,
     InputHint,
     SimpleLevels,
     LevelDirection,
+    Levels,
     Percentage,
+    PredictiveLevels,
     LevelsType,
+    Float,
+    IECMagnitude,
     Integer,
+    TimeMagnitude,
+    TimeSpan,
     migrate_to_float_simple_levels,
+    migrate_to_integer_simple_levels,
     migrate_to_lower_float_levels,
 )
-from cmk.rulesets.v1.rule_specs import Topic, CheckParameters, HostCondition
+from cmk.rulesets.v1.rule_specs import Topic, CheckParameters, HostAndItemCondition
+
+
+def _node_imbalance_element():
+    return DictElement(
+        parameter_form=SimpleLevels(
+            title=Title('Upper levels on the max/mean ratio of traffic per cluster node'),
+            help_text=Help(
+                'The ratio is 1 for an evenly balanced cluster and at most the number of nodes, which is reached '
+                'when one node carries all the traffic, e.g. the active node of an active/standby pair.'
+            ),
+            level_direction=LevelDirection.UPPER,
+            form_spec_template=Float(),
+            prefill_levels_type=DefaultValue(LevelsType.NONE),
+            prefill_fixed_levels=InputHint(value=(1.5, 2.0)),
+            migrate=migrate_to_float_simple_levels,
+        ),
+        required=False,
+    )
+
+
+def _average_element():
+    return DictElement(
+        parameter_form=TimeSpan(
+            title=Title('Average the values over'),
+            help_text=Help(
+                'Apply the levels to the exponentially weighted moving average over this horizon instead of the '
+                'value of a single check interval. The metrics still show the values of each interval.'
+            ),
+            displayed_magnitudes=[TimeMagnitude.MINUTE],
+            prefill=DefaultValue(900.0),
+        ),
+        required=False,
+    )
 
 
 def _parameter_form_unbound_cache():
@@ -60,6 +101,8 @@ def _parameter_form_unbound_cache():
                 ),
                 required=False,
             ),
+            'average': _average_element(),
+            'levels_node_imbalance': _node_imbalance_element(),
         },
     )
 
@@ -69,41 +112,717 @@ rule_spec_unbound_cache = CheckParameters(
     title=Title('Unbound Cache'),
     topic=Topic.APPLICATIONS,
     parameter_form=_parameter_form_unbound_cache,
-    condition=HostCondition(),
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+UNBOUND_ANSWERS = (
+    'NOERROR',
+    'FORMERR',
+    'SERVFAIL',
+    'NXDOMAIN',
+    'NOTIMPL',
+    'REFUSED',
+    'nodata',
 )
 
 
 def _parameter_form_unbound_answers():
     return Dictionary(
         elements={
-            f"levels_upper_{answer}": DictElement(
+            **{
+                f"levels_upper_{answer}": DictElement(
+                    parameter_form=SimpleLevels(
+                        title=Title(f'Upper levels for {answer} answers'),
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Integer(unit_symbol='q/s'),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(100, 1000)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for answer in UNBOUND_ANSWERS
+            },
+            **{
+                f"levels_ratio_{answer}": DictElement(
+                    parameter_form=SimpleLevels(
+                        title=Title(f'Upper levels for {answer} answers in percent of all answers'),
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Percentage(),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(5.0, 10.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for answer in UNBOUND_ANSWERS
+            },
+            'average': _average_element(),
+            'levels_node_imbalance': _node_imbalance_element(),
+        },
+    )
+
+
+rule_spec_unbound_answers = CheckParameters(
+    name='unbound_answers',
+    title=Title('Unbound Answers'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_answers,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_recursion_latency():
+    return Dictionary(
+        elements={
+            f"levels_p{percentile}": DictElement(
                 parameter_form=SimpleLevels(
-                    title=Title(f'Upper levels for {answer} answers'),
+                    title=Title(f'Upper levels for the {percentile}th percentile'),
                     level_direction=LevelDirection.UPPER,
-                    form_spec_template=Integer(unit_symbol='q/s'),
+                    form_spec_template=TimeSpan(
+                        displayed_magnitudes=[TimeMagnitude.SECOND, TimeMagnitude.MILLISECOND],
+                    ),
                     prefill_levels_type=DefaultValue(LevelsType.NONE),
-                    prefill_fixed_levels=InputHint(value=(100, 1000)),
+                    prefill_fixed_levels=InputHint(value=(0.5, 1.0)),
                     migrate=migrate_to_float_simple_levels,
                 ),
                 required=False,
             )
-            for answer in (
-                'NOERROR',
-                'FORMERR',
-                'SERVFAIL',
-                'NXDOMAIN',
-                'NOTIMPL',
-                'REFUSED',
-                'nodata',
-            )
+            for percentile in (50, 90, 95, 99)
         },
     )
 
 
-rule_spec_unbound_answers = CheckParameters(
-    name='unbound_answers',
-    title=Title('Unbound Answers'),
+rule_spec_unbound_recursion_latency = CheckParameters(
+    name='unbound_recursion_latency',
+    title=Title('Unbound Recursion Latency'),
     topic=Topic.APPLICATIONS,
-    parameter_form=_parameter_form_unbound_answers,
-    condition=HostCondition(),
+    parameter_form=_parameter_form_unbound_recursion_latency,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_threads():
+    return Dictionary(
+        elements={
+            'imbalance': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the max/mean ratio of queries per thread'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1.5, 2.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'requestlist': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the request list size of a thread'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Integer(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(400, 500)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_threads = CheckParameters(
+    name='unbound_threads',
+    title=Title('Unbound Threads'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_threads,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_memory():
+    return Dictionary(
+        elements={
+            'levels': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the total memory'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=DataSize(
+                        displayed_magnitudes=[IECMagnitude.MEBI, IECMagnitude.GIBI],
+                    ),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1024 ** 3, 2 * 1024 ** 3)),
+                    migrate=migrate_to_integer_simple_levels,
+                ),
+                required=False,
+            ),
+            'msg_cache_size': DictElement(
+                parameter_form=DataSize(
+                    title=Title('Configured msg-cache-size'),
+                    displayed_magnitudes=[IECMagnitude.KIBI, IECMagnitude.MEBI, IECMagnitude.GIBI],
+                    prefill=DefaultValue(4 * 1024 ** 2),
+                ),
+                required=False,
+            ),
+            'rrset_cache_size': DictElement(
+                parameter_form=DataSize(
+                    title=Title('Configured rrset-cache-size'),
+                    displayed_magnitudes=[IECMagnitude.KIBI, IECMagnitude.MEBI, IECMagnitude.GIBI],
+                    prefill=DefaultValue(4 * 1024 ** 2),
+                ),
+                required=False,
+            ),
+            'levels_fill': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the fill ratio of the message and rrset cache'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(90.0, 95.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_time_left': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Lower levels on the time until a cache is full'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=TimeSpan(
+                        displayed_magnitudes=[TimeMagnitude.DAY, TimeMagnitude.HOUR, TimeMagnitude.MINUTE],
+                    ),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(86400.0, 3600.0)),
+                    migrate=migrate_to_lower_float_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_memory = CheckParameters(
+    name='unbound_memory',
+    title=Title('Unbound Memory'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_memory,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_requestlist():
+    return Dictionary(
+        elements={
+            'num_queries_per_thread': DictElement(
+                parameter_form=Integer(
+                    title=Title('Configured num-queries-per-thread'),
+                    prefill=DefaultValue(1024),
+                ),
+                required=False,
+            ),
+            'levels_utilization': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the request list utilization'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.FIXED),
+                    prefill_fixed_levels=DefaultValue(value=(80.0, 90.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            **{
+                param: DictElement(
+                    parameter_form=SimpleLevels(
+                        title=title,
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Float(unit_symbol='q/s'),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(1.0, 10.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for param, title in (
+                    ('levels_exceeded', Title('Upper levels on queries dropped because the request list was full')),
+                    ('levels_overwritten', Title('Upper levels on requests overwritten by newer requests')),
+                    ('levels_timed_out', Title('Upper levels on queries timed out in the request queue')),
+                )
+            },
+            'levels_queue_time': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the maximum queue time'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=TimeSpan(
+                        displayed_magnitudes=[TimeMagnitude.SECOND, TimeMagnitude.MILLISECOND],
+                    ),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(0.5, 1.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_requestlist = CheckParameters(
+    name='unbound_requestlist',
+    title=Title('Unbound Request List'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_requestlist,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_queries():
+    return Dictionary(
+        elements={
+            'levels_upper': DictElement(
+                parameter_form=Levels(
+                    title=Title('Upper levels on queries per second'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='q/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1000.0, 2000.0)),
+                    predictive=PredictiveLevels(
+                        reference_metric='unbound_queries_rate',
+                        prefill_abs_diff=InputHint(value=(500.0, 1000.0)),
+                        prefill_rel_diff=InputHint(value=(50.0, 100.0)),
+                        prefill_stdev_diff=InputHint(value=(2.0, 4.0)),
+                    ),
+                ),
+                required=False,
+            ),
+            'levels_lower': DictElement(
+                parameter_form=Levels(
+                    title=Title('Lower levels on queries per second'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=Float(unit_symbol='q/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(10.0, 1.0)),
+                    predictive=PredictiveLevels(
+                        reference_metric='unbound_queries_rate',
+                        prefill_abs_diff=InputHint(value=(500.0, 1000.0)),
+                        prefill_rel_diff=InputHint(value=(50.0, 80.0)),
+                        prefill_stdev_diff=InputHint(value=(2.0, 4.0)),
+                    ),
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_queries = CheckParameters(
+    name='unbound_queries',
+    title=Title('Unbound Queries'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_queries,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_prefetch():
+    return Dictionary(
+        elements={
+            'levels_prefetch_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on prefetches in percent of cache hits'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(20.0, 40.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_expired': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on expired answers per second'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='q/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1.0, 10.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_expired_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on expired answers in percent of queries'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(5.0, 10.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_prefetch = CheckParameters(
+    name='unbound_prefetch',
+    title=Title('Unbound Prefetch'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_prefetch,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_dnssec():
+    return Dictionary(
+        elements={
+            'levels_bogus': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on bogus answers per second'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='1/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1.0, 10.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_bogus_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on bogus answers in percent of all answers'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1.0, 5.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_rrset_bogus': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on bogus RRsets per second'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='1/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1.0, 10.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_dnssec = CheckParameters(
+    name='unbound_dnssec',
+    title=Title('Unbound DNSSEC'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_dnssec,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_cache_tables():
+    return Dictionary(
+        elements={
+            'levels_collisions': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the maximum hash table collisions'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Integer(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(8, 16)),
+                    migrate=migrate_to_integer_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_growth': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the cache entry growth'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='1/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(100.0, 1000.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_cache_tables = CheckParameters(
+    name='unbound_cache_tables',
+    title=Title('Unbound Cache Tables'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_cache_tables,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_uptime():
+    return Dictionary(
+        elements={
+            'levels_lower': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Lower levels on the uptime after a restart'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=TimeSpan(
+                        displayed_magnitudes=[TimeMagnitude.DAY, TimeMagnitude.HOUR, TimeMagnitude.MINUTE],
+                    ),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(3600.0, 600.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_uptime = CheckParameters(
+    name='unbound_uptime',
+    title=Title('Unbound Uptime'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_uptime,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_ecs_cachedb():
+    return Dictionary(
+        elements={
+            'levels_subnet_hit_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Lower levels on the ECS cache hit ratio'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(50.0, 25.0)),
+                    migrate=migrate_to_lower_float_levels,
+                ),
+                required=False,
+            ),
+            'levels_subnet_memory': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the memory of the ECS module'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=DataSize(
+                        displayed_magnitudes=[IECMagnitude.MEBI, IECMagnitude.GIBI],
+                    ),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(512 * 1024 ** 2, 1024 ** 3)),
+                    migrate=migrate_to_integer_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_cachedb_hit_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Lower levels on the cachedb hit ratio of internal cache misses'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(50.0, 25.0)),
+                    migrate=migrate_to_lower_float_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_ecs_cachedb = CheckParameters(
+    name='unbound_ecs_cachedb',
+    title=Title('Unbound ECS and Cachedb'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_ecs_cachedb,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_upstream():
+    return Dictionary(
+        elements={
+            'levels_upstream': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on outgoing queries per second'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(unit_symbol='q/s'),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(1000.0, 5000.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_amplification': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on outgoing queries per recursive reply'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Float(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(3.0, 5.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_tcp_share': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the TCP share of outgoing queries'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(10.0, 25.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_upstream = CheckParameters(
+    name='unbound_upstream',
+    title=Title('Unbound Upstream'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_upstream,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_query_types():
+    return Dictionary(
+        elements={
+            **{
+                f'levels_upper_{qtype}': DictElement(
+                    parameter_form=SimpleLevels(
+                        title=Title(f'Upper levels for {qtype} queries per second'),
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Float(unit_symbol='q/s'),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(10.0, 100.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for qtype in ('ANY', 'TXT', 'DNSKEY', 'RRSIG', 'NULL', 'AXFR', 'IXFR')
+            },
+            **{
+                f'levels_share_{qtype}': DictElement(
+                    parameter_form=SimpleLevels(
+                        title=Title(f'Upper levels for the share of {qtype} queries'),
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Percentage(),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(5.0, 10.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for qtype in ('ANY', 'TXT', 'DNSKEY', 'RRSIG', 'NULL', 'AXFR', 'IXFR')
+            },
+        },
+    )
+
+
+rule_spec_unbound_query_types = CheckParameters(
+    name='unbound_query_types',
+    title=Title('Unbound Query Types'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_query_types,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_tcp_tls():
+    return Dictionary(
+        elements={
+            'incoming_num_tcp': DictElement(
+                parameter_form=Integer(
+                    title=Title('Configured incoming-num-tcp'),
+                    prefill=DefaultValue(10),
+                ),
+                required=False,
+            ),
+            'levels_tcp_usage': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Upper levels on the TCP buffer usage'),
+                    level_direction=LevelDirection.UPPER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.FIXED),
+                    prefill_fixed_levels=DefaultValue(value=(80.0, 90.0)),
+                    migrate=migrate_to_float_simple_levels,
+                ),
+                required=False,
+            ),
+            'levels_tls_resume_ratio': DictElement(
+                parameter_form=SimpleLevels(
+                    title=Title('Lower levels on the share of resumed TLS queries'),
+                    level_direction=LevelDirection.LOWER,
+                    form_spec_template=Percentage(),
+                    prefill_levels_type=DefaultValue(LevelsType.NONE),
+                    prefill_fixed_levels=InputHint(value=(50.0, 25.0)),
+                    migrate=migrate_to_lower_float_levels,
+                ),
+                required=False,
+            ),
+        },
+    )
+
+
+rule_spec_unbound_tcp_tls = CheckParameters(
+    name='unbound_tcp_tls',
+    title=Title('Unbound TCP/TLS'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_tcp_tls,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
+)
+
+
+def _parameter_form_unbound_ratelimit():
+    return Dictionary(
+        elements={
+            **{
+                param: DictElement(
+                    parameter_form=SimpleLevels(
+                        title=title,
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Float(unit_symbol='q/s'),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(10.0, 100.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for param, title in (
+                    ('levels_ip_ratelimited', Title('Upper levels on queries dropped by ip-ratelimit')),
+                    ('levels_ratelimited', Title('Upper levels on queries dropped by ratelimit')),
+                    ('levels_cookie_invalid', Title('Upper levels on queries with invalid DNS cookies')),
+                )
+            },
+            **{
+                param: DictElement(
+                    parameter_form=SimpleLevels(
+                        title=title,
+                        level_direction=LevelDirection.UPPER,
+                        form_spec_template=Percentage(),
+                        prefill_levels_type=DefaultValue(LevelsType.NONE),
+                        prefill_fixed_levels=InputHint(value=(1.0, 5.0)),
+                        migrate=migrate_to_float_simple_levels,
+                    ),
+                    required=False,
+                )
+                for param, title in (
+                    ('levels_ratelimited_ratio', Title('Upper levels on rate limited queries in percent of all queries')),
+                    ('levels_cookie_invalid_ratio', Title('Upper levels on queries with invalid DNS cookies in percent of all queries')),
+                )
+            },
+        },
+    )
+
+
+rule_spec_unbound_ratelimit = CheckParameters(
+    name='unbound_ratelimit',
+    title=Title('Unbound Rate Limiting'),
+    topic=Topic.APPLICATIONS,
+    parameter_form=_parameter_form_unbound_ratelimit,
+    condition=HostAndItemCondition(item_title=Title('Instance')),
 )
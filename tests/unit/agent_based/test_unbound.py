@@ -21,6 +21,7 @@
 
 import pytest  # type: ignore[import]
 from cmk.agent_based.v2 import (
+    IgnoreResultsError,
     Metric,
     Result,
     Service,
@@ -320,22 +321,85 @@ EXAMPLE_SECTION = {
 }
 
 
+EXAMPLE_PARSED = unbound.parse_unbound(EXAMPLE_STRING_TABLE)
+EXAMPLE_INSTANCE = EXAMPLE_PARSED['default']
+EMPTY_PARSED = unbound.parse_unbound([])
+
+
+def _parse_with(overrides):
+    return unbound.parse_unbound([
+        [key, overrides.get(key, value)] for key, value in EXAMPLE_STRING_TABLE
+    ])
+
+
 def test_parse_unbound():
-    assert unbound.parse_unbound(EXAMPLE_STRING_TABLE) == EXAMPLE_SECTION
+    assert unbound.parse_unbound(EXAMPLE_STRING_TABLE) == {'default': EXAMPLE_SECTION}
+
+
+def test_parse_unbound_instances():
+    section = unbound.parse_unbound([
+        ['[[[internal]]]'],
+        *EXAMPLE_STRING_TABLE,
+        ['[[[external]]]'],
+        ['total.num.queries', '42'],
+        ['[[[broken]]]'],
+        ['error: connect: Connection refused for 127.0.0.1 port 8953'],
+    ])
+    assert list(section) == ['internal', 'external']
+    assert section['internal'] == EXAMPLE_SECTION
+    assert section['external'] == {'total.num.queries': 42}
+
+
+@pytest.mark.parametrize('key', list(EXAMPLE_SECTION))
+def test_parse_unbound_flat_keys(key):
+    assert key in EXAMPLE_INSTANCE
+    assert EXAMPLE_INSTANCE[key] == EXAMPLE_SECTION[key]
+
+
+def test_parse_unbound_structure():
+    assert EXAMPLE_INSTANCE.now == 1743744886.505331
+    assert EXAMPLE_INSTANCE.total['num.cachehits'] == 171
+    assert EXAMPLE_INSTANCE.threads[0]['recursion.time.avg'] == 0.001525
+    assert EXAMPLE_INSTANCE.rcode['NXDOMAIN'] == 93
+    assert EXAMPLE_INSTANCE.qtype == {'A': 170, 'AAAA': 21, 'SRV': 14}
+    assert EXAMPLE_INSTANCE.flags['RD'] == 205
+    assert EXAMPLE_INSTANCE.mem['cache.rrset'] == 68548
+    assert len(EXAMPLE_INSTANCE.histogram) == 40
+    assert EXAMPLE_INSTANCE.histogram[11] == unbound.HistogramBucket(0.001024, 0.002048, 24)
+    assert len(EXAMPLE_INSTANCE) == len(EXAMPLE_SECTION)
+
+
+@pytest.mark.parametrize('key', [
+    'thread1.num.queries',
+    'total.num.unknown',
+    'histogram.000000.000000.to.000000.000003',
+    'unknown',
+])
+def test_parse_unbound_missing_keys(key):
+    assert key not in EXAMPLE_INSTANCE
+    assert EXAMPLE_INSTANCE.get(key) is None
 
 
 @pytest.mark.parametrize('section, result', [
-    (EXAMPLE_SECTION, [Service()]),
-    ({}, []),
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
 ])
 def test_discover_unbound_cache(section, result):
     assert list(unbound.discover_unbound_cache(section)) == result
 
 
+CACHE_ENTRY_RESULTS = [
+    Result(state=State.OK, summary='Message cache entries: 10'),
+    Metric('unbound_cache_msg_entries', 10.0),
+    Result(state=State.OK, summary='RRset cache entries: 8'),
+    Metric('unbound_cache_rrset_entries', 8.0),
+]
+
+
 @pytest.mark.parametrize('params, section, result', [
     (
         {},
-        EXAMPLE_SECTION,
+        EXAMPLE_PARSED,
         [
             Result(state=State.OK, notice='Cache Misses: 34.00/s'),
             Metric('cache_misses_rate', 34.0),
@@ -343,11 +407,12 @@ def test_discover_unbound_cache(section, result):
             Metric('cache_hit_rate', 171.0),
             Result(state=State.OK, summary='Cache Hit Ratio: 83.41%'),
             Metric('cache_hit_ratio', 83.41463414634146),
+            *CACHE_ENTRY_RESULTS,
         ]
     ),
     (
         {'cache_misses': ('fixed', (50, 60)), 'cache_hits': ('fixed', (75, 50))},
-        EXAMPLE_SECTION,
+        EXAMPLE_PARSED,
         [
             Result(state=State.OK, notice='Cache Misses: 34.00/s'),
             Metric('cache_misses_rate', 34.0, levels=(50.0, 60.0)),
@@ -355,11 +420,12 @@ def test_discover_unbound_cache(section, result):
             Metric('cache_hit_rate', 171.0),
             Result(state=State.OK, summary='Cache Hit Ratio: 83.41%'),
             Metric('cache_hit_ratio', 83.41463414634146),
+            *CACHE_ENTRY_RESULTS,
         ]
     ),
     (
         {'cache_misses': ('fixed', (20, 60)), 'cache_hits': ('fixed', (90, 50))},
-        EXAMPLE_SECTION,
+        EXAMPLE_PARSED,
         [
             Result(state=State.WARN, notice='Cache Misses: 34.00/s (warn/crit at 20.00/s/60.00/s)'),
             Metric('cache_misses_rate', 34.0, levels=(20.0, 60.0)),
@@ -367,11 +433,12 @@ def test_discover_unbound_cache(section, result):
             Metric('cache_hit_rate', 171.0),
             Result(state=State.WARN, summary='Cache Hit Ratio: 83.41% (warn/crit below 90.00%/50.00%)'),
             Metric('cache_hit_ratio', 83.41463414634146),
+            *CACHE_ENTRY_RESULTS,
         ]
     ),
     (
         {'cache_misses': ('fixed', (20, 30)), 'cache_hits': ('fixed', (90, 85))},
-        EXAMPLE_SECTION,
+        EXAMPLE_PARSED,
         [
             Result(state=State.CRIT, notice='Cache Misses: 34.00/s (warn/crit at 20.00/s/30.00/s)'),
             Metric('cache_misses_rate', 34.0, levels=(20.0, 30.0)),
@@ -379,114 +446,141 @@ def test_discover_unbound_cache(section, result):
             Metric('cache_hit_rate', 171.0),
             Result(state=State.CRIT, summary='Cache Hit Ratio: 83.41% (warn/crit below 90.00%/85.00%)'),
             Metric('cache_hit_ratio', 83.41463414634146),
+            *CACHE_ENTRY_RESULTS,
         ]
     ),
 ])
 def test_check_ovpnlicense(monkeypatch, params, section, result):
     monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
-    monkeypatch.setattr(unbound, 'get_rate', lambda _v, _k, _t, v, raise_overflow=True: v)
-    assert list(unbound.check_unbound_cache(params, section)) == result
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_cache('default', params, section)) == result
+
+
+def test_check_unbound_cache_averaged(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    params = {'cache_hits': ('fixed', (90.0, 50.0)), 'average': 900.0}
+
+    results = list(unbound.check_unbound_cache('default', params, EXAMPLE_PARSED))
+    assert Result(
+        state=State.WARN,
+        summary=f'Cache Hit Ratio ({unbound.render.timespan(900.0)} average): 83.41% (warn/crit below 90.00%/50.00%)',
+    ) in results
+    assert Metric('cache_hit_ratio', 83.41463414634146) in results
+
+    results = list(unbound.check_unbound_cache('default', params, _parse_with({
+        'time.now': str(EXAMPLE_SECTION['time.now'] + 60),
+        'total.num.cachemiss': '513',
+    })))
+    # the levels apply to the average, the metric shows the interval
+    assert Metric('cache_hit_ratio', 25.0) in results
+    averaged = value_store['unbound_average.cache_hit_ratio'][-1]
+    assert 25.0 < averaged < 83.41463414634146
+    assert Result(
+        state=State.WARN if averaged >= 50.0 else State.CRIT,
+        summary=(
+            f'Cache Hit Ratio ({unbound.render.timespan(900.0)} average): {unbound.render.percent(averaged)} '
+            '(warn/crit below 90.00%/50.00%)'
+        ),
+    ) in results
 
 
 @pytest.mark.parametrize('section, result', [
-    (EXAMPLE_SECTION, [Service()]),
-    ({}, []),
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
 ])
 def test_discover_unbound_answers(section, result):
     assert list(unbound.discover_unbound_answers(section)) == result
 
 
+def _answer_results(noerror=(Result(state=State.OK, notice='NOERROR: 25.00/s'), Metric('unbound_answers_NOERROR', 25.0))):
+    # rates of EXAMPLE_PARSED, 205 answers per second without nodata
+    results = [
+        Result(state=State.OK, summary='Answers: 205.00/s'),
+        Metric('unbound_answers_rate', 205.0),
+    ]
+    for answer, rate in (
+        ('NOERROR', 25.0), ('FORMERR', 0.0), ('SERVFAIL', 0.0), ('NXDOMAIN', 93.0),
+        ('NOTIMPL', 0.0), ('REFUSED', 87.0), ('nodata', 10.0),
+    ):
+        if answer == 'NOERROR':
+            results.extend(noerror)
+        else:
+            results.append(Result(state=State.OK, notice=f'{answer}: {rate:.2f}/s'))
+            results.append(Metric(f'unbound_answers_{answer}', rate))
+        results.append(Result(state=State.OK, notice=f'{answer} share: {unbound.render.percent(rate * 100.0 / 205)}'))
+        results.append(Metric(f'unbound_answers_{answer}_ratio', rate * 100.0 / 205))
+    return results
+
+
 @pytest.mark.parametrize('params, section, result', [
     (
         {},
-        EXAMPLE_SECTION,
-        [
-            Result(state=State.OK, notice='NOERROR: 25.00/s'),
-            Metric('unbound_answers_NOERROR', 25.0),
-            Result(state=State.OK, notice='FORMERR: 0.00/s'),
-            Metric('unbound_answers_FORMERR', 0.0),
-            Result(state=State.OK, notice='SERVFAIL: 0.00/s'),
-            Metric('unbound_answers_SERVFAIL', 0.0),
-            Result(state=State.OK, notice='NXDOMAIN: 93.00/s'),
-            Metric('unbound_answers_NXDOMAIN', 93.0),
-            Result(state=State.OK, notice='NOTIMPL: 0.00/s'),
-            Metric('unbound_answers_NOTIMPL', 0.0),
-            Result(state=State.OK, notice='REFUSED: 87.00/s'),
-            Metric('unbound_answers_REFUSED', 87.0),
-            Result(state=State.OK, notice='nodata: 10.00/s'),
-            Metric('unbound_answers_nodata', 10.0),
-        ]
+        EXAMPLE_PARSED,
+        _answer_results(),
     ),
     (
         {'levels_upper_NOERROR': ('fixed', (30, 50))},
-        EXAMPLE_SECTION,
-        [
+        EXAMPLE_PARSED,
+        _answer_results(noerror=[
             Result(state=State.OK, summary='NOERROR: 25.00/s'),
             Metric('unbound_answers_NOERROR', 25.0, levels=(30.0, 50.0)),
-            Result(state=State.OK, notice='FORMERR: 0.00/s'),
-            Metric('unbound_answers_FORMERR', 0.0),
-            Result(state=State.OK, notice='SERVFAIL: 0.00/s'),
-            Metric('unbound_answers_SERVFAIL', 0.0),
-            Result(state=State.OK, notice='NXDOMAIN: 93.00/s'),
-            Metric('unbound_answers_NXDOMAIN', 93.0),
-            Result(state=State.OK, notice='NOTIMPL: 0.00/s'),
-            Metric('unbound_answers_NOTIMPL', 0.0),
-            Result(state=State.OK, notice='REFUSED: 87.00/s'),
-            Metric('unbound_answers_REFUSED', 87.0),
-            Result(state=State.OK, notice='nodata: 10.00/s'),
-            Metric('unbound_answers_nodata', 10.0),
-        ]
+        ]),
     ),
     (
         {'levels_upper_NOERROR': ('fixed', (15, 50))},
-        EXAMPLE_SECTION,
-        [
+        EXAMPLE_PARSED,
+        _answer_results(noerror=[
             Result(state=State.WARN, summary='NOERROR: 25.00/s (warn/crit at 15.00/s/50.00/s)'),
             Metric('unbound_answers_NOERROR', 25.0, levels=(15.0, 50.0)),
-            Result(state=State.OK, notice='FORMERR: 0.00/s'),
-            Metric('unbound_answers_FORMERR', 0.0),
-            Result(state=State.OK, notice='SERVFAIL: 0.00/s'),
-            Metric('unbound_answers_SERVFAIL', 0.0),
-            Result(state=State.OK, notice='NXDOMAIN: 93.00/s'),
-            Metric('unbound_answers_NXDOMAIN', 93.0),
-            Result(state=State.OK, notice='NOTIMPL: 0.00/s'),
-            Metric('unbound_answers_NOTIMPL', 0.0),
-            Result(state=State.OK, notice='REFUSED: 87.00/s'),
-            Metric('unbound_answers_REFUSED', 87.0),
-            Result(state=State.OK, notice='nodata: 10.00/s'),
-            Metric('unbound_answers_nodata', 10.0),
-        ]
+        ]),
     ),
     (
         {'levels_upper_NOERROR': ('fixed', (15, 20))},
-        EXAMPLE_SECTION,
-        [
+        EXAMPLE_PARSED,
+        _answer_results(noerror=[
             Result(state=State.CRIT, summary='NOERROR: 25.00/s (warn/crit at 15.00/s/20.00/s)'),
             Metric('unbound_answers_NOERROR', 25.0, levels=(15.0, 20.0)),
-            Result(state=State.OK, notice='FORMERR: 0.00/s'),
-            Metric('unbound_answers_FORMERR', 0.0),
-            Result(state=State.OK, notice='SERVFAIL: 0.00/s'),
-            Metric('unbound_answers_SERVFAIL', 0.0),
-            Result(state=State.OK, notice='NXDOMAIN: 93.00/s'),
-            Metric('unbound_answers_NXDOMAIN', 93.0),
-            Result(state=State.OK, notice='NOTIMPL: 0.00/s'),
-            Metric('unbound_answers_NOTIMPL', 0.0),
-            Result(state=State.OK, notice='REFUSED: 87.00/s'),
-            Metric('unbound_answers_REFUSED', 87.0),
-            Result(state=State.OK, notice='nodata: 10.00/s'),
-            Metric('unbound_answers_nodata', 10.0),
-        ]
+        ]),
     ),
 ])
 def test_check_unbound_answers(monkeypatch, params, section, result):
     monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
-    monkeypatch.setattr(unbound, 'get_rate', lambda _v, _k, _t, v, raise_overflow=True: v)
-    assert list(unbound.check_unbound_answers(params, section)) == result
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_answers('default', params, section)) == result
+
+
+def test_check_unbound_answers_ratio_levels(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    params = {'levels_ratio_REFUSED': ('fixed', (5.0, 10.0)), 'levels_ratio_SERVFAIL': ('fixed', (5.0, 10.0))}
+    results = list(unbound.check_unbound_answers('default', params, EXAMPLE_PARSED))
+    assert Result(
+        state=State.CRIT,
+        summary=f'REFUSED share: {unbound.render.percent(87 * 100.0 / 205)} (warn/crit at 5.00%/10.00%)',
+    ) in results
+    assert Metric('unbound_answers_REFUSED_ratio', 87 * 100.0 / 205, levels=(5.0, 10.0)) in results
+    assert Result(state=State.OK, summary=f'SERVFAIL share: {unbound.render.percent(0.0)}') in results
+
+
+def test_check_unbound_answers_averaged(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    params = {'levels_upper_SERVFAIL': ('fixed', (10, 100)), 'average': 300.0}
+    results = list(unbound.check_unbound_answers('default', params, _parse_with({'num.answer.rcode.SERVFAIL': '20'})))
+    assert Result(
+        state=State.WARN,
+        summary=f'SERVFAIL ({unbound.render.timespan(300.0)} average): 20.00/s (warn/crit at 10.00/s/100.00/s)',
+    ) in results
+    assert Metric('unbound_answers_SERVFAIL', 20.0) in results
+    assert 'unbound_average.unbound_answers_SERVFAIL' in value_store
 
 
 @pytest.mark.parametrize('section, result', [
-    (EXAMPLE_SECTION, [Service()]),
-    ({}, []),
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
 ])
 def test_discover_unbound_unwanted_replies(section, result):
     assert list(unbound.discover_unbound_unwanted_replies(section)) == result
@@ -494,21 +588,21 @@ def test_discover_unbound_unwanted_replies(section, result):
 
 @pytest.mark.parametrize('section, result', [
     (
-        EXAMPLE_SECTION,
+        EXAMPLE_PARSED,
         [
             Result(state=State.OK, summary='Unwanted Replies: 0.00/s'),
             Metric('unbound_unwanted_replies', 0.0, levels=(10.0, 100.0)),
         ]
     ),
     (
-        {**EXAMPLE_SECTION, 'unwanted.replies': 15},
+        _parse_with({'unwanted.replies': '15'}),
         [
             Result(state=State.WARN, summary='Unwanted Replies: 15.00/s (warn/crit at 10.00/s/100.00/s)'),
             Metric('unbound_unwanted_replies', 15.0, levels=(10.0, 100.0)),
         ]
     ),
     (
-        {**EXAMPLE_SECTION, 'unwanted.replies': 150},
+        _parse_with({'unwanted.replies': '150'}),
         [
             Result(state=State.CRIT, summary='Unwanted Replies: 150.00/s (warn/crit at 10.00/s/100.00/s)'),
             Metric('unbound_unwanted_replies', 150.0, levels=(10.0, 100.0)),
@@ -517,5 +611,1114 @@ def test_discover_unbound_unwanted_replies(section, result):
 ])
 def test_check_unbound_unwanted_replies(monkeypatch, section, result):
     monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
-    monkeypatch.setattr(unbound, 'get_rate', lambda _v, _k, _t, v, raise_overflow=True: v)
-    assert list(unbound.check_unbound_unwanted_replies(section)) == result
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_unwanted_replies('default', section)) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_recursion_latency(section, result):
+    assert list(unbound.discover_unbound_recursion_latency(section)) == result
+
+
+def _counter_state(now, up, counters):
+    return (now, up, tuple(counters), tuple(counters.values()))
+
+
+EXAMPLE_HISTOGRAM_BASELINE = _counter_state(
+    EXAMPLE_SECTION['time.now'] - 60,
+    EXAMPLE_SECTION['time.up'] - 60,
+    {key: 0 for key in EXAMPLE_SECTION if key.startswith('histogram.')},
+)
+
+
+@pytest.mark.parametrize('params, result', [
+    (
+        {},
+        [
+            (State.OK, Metric('unbound_recursion_latency_p50', 0.001536)),
+            (State.OK, Metric('unbound_recursion_latency_p90', 0.00270336)),
+            (State.OK, Metric('unbound_recursion_latency_p95', 0.00339968)),
+            (State.OK, Metric('unbound_recursion_latency_p99', 0.003956736)),
+        ]
+    ),
+    (
+        {'levels_p95': ('fixed', (0.003, 0.004)), 'levels_p99': ('fixed', (0.002, 0.003))},
+        [
+            (State.OK, Metric('unbound_recursion_latency_p50', 0.001536)),
+            (State.OK, Metric('unbound_recursion_latency_p90', 0.00270336)),
+            (State.WARN, Metric('unbound_recursion_latency_p95', 0.00339968, levels=(0.003, 0.004))),
+            (State.CRIT, Metric('unbound_recursion_latency_p99', 0.003956736, levels=(0.002, 0.003))),
+        ]
+    ),
+])
+def test_check_unbound_recursion_latency(monkeypatch, params, result):
+    value_store = {'unbound_counters': EXAMPLE_HISTOGRAM_BASELINE}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    results = list(unbound.check_unbound_recursion_latency('default', params, EXAMPLE_PARSED))
+    assert [(r.state, pytest.approx(m.value)) for r, m in zip(results[::2], results[1::2])] == [
+        (state, metric.value) for state, metric in result
+    ]
+    assert [(m.name, m.levels) for m in results[1::2]] == [(metric.name, metric.levels) for _state, metric in result]
+
+
+def test_check_unbound_recursion_latency_initializing(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_recursion_latency('default', {}, EXAMPLE_PARSED))
+    assert value_store['unbound_counters'][0] == EXAMPLE_SECTION['time.now']
+
+
+def test_check_unbound_recursion_latency_idle(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_recursion_latency('default', {}, EXAMPLE_PARSED))
+    section = _parse_with({'time.now': str(EXAMPLE_SECTION['time.now'] + 60)})
+    assert list(unbound.check_unbound_recursion_latency('default', {}, section)) == [
+        Result(state=State.OK, summary='No recursive replies in interval'),
+    ]
+
+
+SUMMARY_STRING_TABLE = [
+    line for line in EXAMPLE_STRING_TABLE if not line[0].startswith('histogram.')
+] + [
+    ['histogram.summary.interval', '60.000000'],
+    ['histogram.summary.count', '34'],
+    ['histogram.summary.p50', '0.001536'],
+    ['histogram.summary.p90', '0.002703'],
+    ['histogram.summary.p95', '0.003400'],
+    ['histogram.summary.p99', '0.003957'],
+    ['histogram.summary.max', '0.004096'],
+]
+
+
+def test_parse_unbound_histogram_summary():
+    instance = unbound.parse_unbound(SUMMARY_STRING_TABLE)['default']
+    assert instance.histogram == ()
+    assert instance.latency == {
+        'interval': 60.0, 'count': 34, 'p50': 0.001536, 'p90': 0.002703, 'p95': 0.0034, 'p99': 0.003957, 'max': 0.004096,
+    }
+    assert instance['histogram.summary.count'] == 34
+
+
+def test_check_unbound_recursion_latency_summary(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    section = unbound.parse_unbound(SUMMARY_STRING_TABLE)
+    assert list(unbound.discover_unbound_recursion_latency(section)) == [Service(item='default')]
+    results = list(unbound.check_unbound_recursion_latency('default', {'levels_p99': ('fixed', (0.002, 0.003))}, section))
+    assert [m for m in results if isinstance(m, Metric)] == [
+        Metric('unbound_recursion_latency_p50', 0.001536),
+        Metric('unbound_recursion_latency_p90', 0.002703),
+        Metric('unbound_recursion_latency_p95', 0.0034),
+        Metric('unbound_recursion_latency_p99', 0.003957, levels=(0.002, 0.003)),
+    ]
+    assert results[-3].state == State.CRIT
+    assert results[-1] == Result(
+        state=State.OK,
+        notice=f'Slowest replies: below {unbound.render.timespan(0.004096)}',
+    )
+
+
+def test_check_unbound_recursion_latency_summary_initializing():
+    section = unbound.parse_unbound([
+        line for line in SUMMARY_STRING_TABLE if not line[0].startswith('histogram.')
+    ] + [['histogram.summary.interval', '0']])
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_recursion_latency('default', {}, section))
+
+
+THREADS_PARSED = unbound.parse_unbound([
+    ['thread0.num.queries', '100'],
+    ['thread0.requestlist.current.all', '3'],
+    ['thread1.num.queries', '300'],
+    ['thread1.requestlist.current.all', '12'],
+    ['time.now', '1743744886.505331'],
+])
+
+
+@pytest.mark.parametrize('section, result', [
+    (THREADS_PARSED, [Service(item='default')]),
+    (EXAMPLE_PARSED, []),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_threads(section, result):
+    assert list(unbound.discover_unbound_threads(section)) == result
+
+
+@pytest.mark.parametrize('params, result', [
+    (
+        {},
+        [
+            Result(state=State.OK, summary='Max/mean imbalance: 1.50'),
+            Metric('unbound_threads_imbalance', 1.5),
+            Result(state=State.OK, summary='Hottest thread: 1 (300.00/s)'),
+            Metric('unbound_threads_max_queries_rate', 300.0),
+            Metric('unbound_threads_mean_queries_rate', 200.0),
+            Result(state=State.OK, notice='Thread 0: 100.00/s'),
+            Result(state=State.OK, notice='Thread 0 request list: 3'),
+            Result(state=State.OK, notice='Thread 1: 300.00/s'),
+            Result(state=State.OK, notice='Thread 1 request list: 12'),
+        ]
+    ),
+    (
+        {'imbalance': ('fixed', (1.2, 2.0)), 'requestlist': ('fixed', (10, 20))},
+        [
+            Result(state=State.WARN, summary='Max/mean imbalance: 1.50 (warn/crit at 1.20/2.00)'),
+            Metric('unbound_threads_imbalance', 1.5, levels=(1.2, 2.0)),
+            Result(state=State.OK, summary='Hottest thread: 1 (300.00/s)'),
+            Metric('unbound_threads_max_queries_rate', 300.0),
+            Metric('unbound_threads_mean_queries_rate', 200.0),
+            Result(state=State.OK, notice='Thread 0: 100.00/s'),
+            Result(state=State.OK, notice='Thread 0 request list: 3'),
+            Result(state=State.OK, notice='Thread 1: 300.00/s'),
+            Result(state=State.WARN, notice='Thread 1 request list: 12 (warn/crit at 10/20)'),
+        ]
+    ),
+])
+def test_check_unbound_threads(monkeypatch, params, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_threads('default', params, THREADS_PARSED)) == result
+
+
+def test_check_unbound_threads_recursion_time(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    section = unbound.parse_unbound([
+        ['thread0.num.queries', '100'],
+        ['thread0.recursion.time.avg', '0.001500'],
+        ['thread1.num.queries', '300'],
+        ['time.now', '1743744886.505331'],
+    ])
+    notices = [r.details for r in unbound.check_unbound_threads('default', {}, section) if isinstance(r, Result)]
+    assert [n for n in notices if 'recursion time' in n] == [
+        f'Thread 0 average recursion time: {unbound.render.timespan(0.0015)}',
+    ]
+
+
+def test_discover_unbound_instances():
+    section = unbound.parse_unbound([
+        ['[[[internal]]]'],
+        *EXAMPLE_STRING_TABLE,
+        ['[[[external]]]'],
+        *EXAMPLE_STRING_TABLE,
+    ])
+    assert list(unbound.discover_unbound_cache(section)) == [
+        Service(item='internal'),
+        Service(item='external'),
+    ]
+    assert list(unbound.check_unbound_unwanted_replies('missing', section)) == []
+
+
+@pytest.mark.parametrize('check, args', [
+    (unbound.check_unbound_cache, ({},)),
+    (unbound.check_unbound_answers, ({},)),
+    (unbound.check_unbound_unwanted_replies, ()),
+    (unbound.check_unbound_recursion_latency, ({},)),
+    (unbound.check_unbound_threads, ({},)),
+])
+def test_check_unbound_stale(monkeypatch, check, args):
+    def counter_rates(*_args, **_kwargs):
+        raise AssertionError('rate computed from stale data')
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', counter_rates)
+    section = unbound.parse_unbound([
+        ['cache.age', '400'],
+        ['cache.max_age', '300'],
+        *EXAMPLE_STRING_TABLE,
+    ])
+    assert list(check('default', *args, section)) == [
+        Result(state=State.UNKNOWN, summary=f'Stale data from {unbound.render.timespan(400)} ago, rates not computed'),
+    ]
+
+
+def test_check_unbound_cached_fresh(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    section = unbound.parse_unbound([
+        ['cache.age', '20'],
+        ['cache.max_age', '300'],
+        *EXAMPLE_STRING_TABLE,
+    ])
+    assert list(unbound.check_unbound_unwanted_replies('default', section)) == [
+        Result(state=State.OK, summary='Unwanted Replies: 0.00/s'),
+        Metric('unbound_unwanted_replies', 0.0, levels=(10.0, 100.0)),
+    ]
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_memory(section, result):
+    assert list(unbound.discover_unbound_memory(section)) == result
+
+
+MEMORY_DEFAULT_PARAMS = {'msg_cache_size': 4194304, 'rrset_cache_size': 4194304}
+
+
+@pytest.mark.parametrize('params, state, metrics', [
+    (
+        MEMORY_DEFAULT_PARAMS,
+        State.OK,
+        [
+            Metric('unbound_mem_total', 220511.0),
+            Metric('unbound_mem_cache_message_fill', 68831 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_message_growth', 68831.0),
+            Metric('unbound_mem_cache_rrset_fill', 68548 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_rrset_growth', 68548.0),
+        ]
+    ),
+    (
+        {**MEMORY_DEFAULT_PARAMS, 'levels': ('fixed', (200000, 300000))},
+        State.WARN,
+        [
+            Metric('unbound_mem_total', 220511.0, levels=(200000.0, 300000.0)),
+            Metric('unbound_mem_cache_message_fill', 68831 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_message_growth', 68831.0),
+            Metric('unbound_mem_cache_rrset_fill', 68548 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_rrset_growth', 68548.0),
+        ]
+    ),
+    (
+        {'msg_cache_size': 100000, 'rrset_cache_size': 4194304, 'levels_fill': ('fixed', (50.0, 60.0))},
+        State.CRIT,
+        [
+            Metric('unbound_mem_total', 220511.0),
+            Metric('unbound_mem_cache_message_fill', 68.831, levels=(50.0, 60.0)),
+            Metric('unbound_mem_cache_message_growth', 68831.0),
+            Metric('unbound_mem_cache_rrset_fill', 68548 * 100.0 / 4194304, levels=(50.0, 60.0)),
+            Metric('unbound_mem_cache_rrset_growth', 68548.0),
+        ]
+    ),
+    (
+        {**MEMORY_DEFAULT_PARAMS, 'levels_time_left': ('fixed', (120.0, 30.0))},
+        State.WARN,
+        [
+            Metric('unbound_mem_total', 220511.0),
+            Metric('unbound_mem_cache_message_fill', 68831 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_message_growth', 68831.0),
+            Metric('unbound_mem_cache_rrset_fill', 68548 * 100.0 / 4194304),
+            Metric('unbound_mem_cache_rrset_growth', 68548.0),
+        ]
+    ),
+])
+def test_check_unbound_memory(monkeypatch, params, state, metrics):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    results = list(unbound.check_unbound_memory('default', params, EXAMPLE_PARSED))
+    assert [r for r in results if isinstance(r, Metric)][:len(metrics)] == metrics
+    assert State.worst(*(r.state for r in results if isinstance(r, Result))) == state
+    assert Metric('unbound_mem_mod_validator', 66384.0) in results
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_requestlist(section, result):
+    assert list(unbound.discover_unbound_requestlist(section)) == result
+
+
+REQUESTLIST_DEFAULT_PARAMS = {'num_queries_per_thread': 1024, 'levels_utilization': ('fixed', (80.0, 90.0))}
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        REQUESTLIST_DEFAULT_PARAMS,
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary=f'Utilization: {unbound.render.percent(0.0)}'),
+            Metric('unbound_requestlist_utilization', 0.0, levels=(80.0, 90.0)),
+            Result(state=State.OK, summary='0 of 1024 requests'),
+            Metric('unbound_requestlist_current', 0.0, boundaries=(0.0, 1024.0)),
+            Result(state=State.OK, notice='Exceeded: 0.00/s'),
+            Metric('unbound_requestlist_exceeded', 0.0),
+            Result(state=State.OK, notice='Overwritten: 0.00/s'),
+            Metric('unbound_requestlist_overwritten', 0.0),
+            Result(state=State.OK, notice='Timed out: 0.00/s'),
+            Metric('unbound_queries_timed_out', 0.0),
+        ]
+    ),
+    (
+        {**REQUESTLIST_DEFAULT_PARAMS, 'levels_exceeded': ('fixed', (1.0, 10.0))},
+        _parse_with({'total.requestlist.current.all': '900', 'total.requestlist.exceeded': '5'}),
+        [
+            Result(state=State.WARN, summary='Utilization: 87.89% (warn/crit at 80.00%/90.00%)'),
+            Metric('unbound_requestlist_utilization', 87.890625, levels=(80.0, 90.0)),
+            Result(state=State.OK, summary='900 of 1024 requests'),
+            Metric('unbound_requestlist_current', 900.0, boundaries=(0.0, 1024.0)),
+            Result(state=State.WARN, summary='Exceeded: 5.00/s (warn/crit at 1.00/s/10.00/s)'),
+            Metric('unbound_requestlist_exceeded', 5.0, levels=(1.0, 10.0)),
+            Result(state=State.OK, notice='Overwritten: 0.00/s'),
+            Metric('unbound_requestlist_overwritten', 0.0),
+            Result(state=State.OK, notice='Timed out: 0.00/s'),
+            Metric('unbound_queries_timed_out', 0.0),
+        ]
+    ),
+    (
+        {'num_queries_per_thread': 512, 'levels_utilization': ('fixed', (80.0, 90.0))},
+        _parse_with({'total.requestlist.current.all': '500'}),
+        [
+            Result(state=State.CRIT, summary='Utilization: 97.66% (warn/crit at 80.00%/90.00%)'),
+            Metric('unbound_requestlist_utilization', 97.65625, levels=(80.0, 90.0)),
+            Result(state=State.OK, summary='500 of 512 requests'),
+            Metric('unbound_requestlist_current', 500.0, boundaries=(0.0, 512.0)),
+            Result(state=State.OK, notice='Exceeded: 0.00/s'),
+            Metric('unbound_requestlist_exceeded', 0.0),
+            Result(state=State.OK, notice='Overwritten: 0.00/s'),
+            Metric('unbound_requestlist_overwritten', 0.0),
+            Result(state=State.OK, notice='Timed out: 0.00/s'),
+            Metric('unbound_queries_timed_out', 0.0),
+        ]
+    ),
+])
+def test_check_unbound_requestlist(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    results = list(unbound.check_unbound_requestlist('default', params, section))
+    assert results[:-2] == result
+    assert results[-1] == Metric('unbound_queue_time_max', 0.0)
+
+
+def test_check_unbound_requestlist_without_thread_stats(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    section = unbound.parse_unbound([
+        line for line in EXAMPLE_STRING_TABLE if not line[0].startswith('thread')
+    ] + [['num.threads', '4'], ['total.requestlist.current.all', '1024']])
+    assert section['default'].thread_count == 4
+    results = list(unbound.check_unbound_requestlist('default', REQUESTLIST_DEFAULT_PARAMS, section))
+    assert Result(state=State.OK, summary='1024 of 4096 requests') in results
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_queries(section, result):
+    assert list(unbound.discover_unbound_queries(section)) == result
+
+
+QUERIES_TRANSPORT_RESULTS = [
+    Result(state=State.OK, notice='TCP: 0.00/s'),
+    Metric('unbound_queries_tcp_rate', 0.0),
+    Result(state=State.OK, notice='TLS: 0.00/s'),
+    Metric('unbound_queries_tls_rate', 0.0),
+    Result(state=State.OK, notice='HTTPS: 0.00/s'),
+    Metric('unbound_queries_https_rate', 0.0),
+    Result(state=State.OK, notice='IPv6: 0.00/s'),
+    Metric('unbound_queries_ipv6_rate', 0.0),
+]
+
+
+@pytest.mark.parametrize('params, result', [
+    (
+        {},
+        [
+            Result(state=State.OK, summary='Queries: 205.00/s'),
+            Metric('unbound_queries_rate', 205.0),
+            *QUERIES_TRANSPORT_RESULTS,
+        ]
+    ),
+    (
+        {'levels_upper': ('fixed', (200.0, 300.0))},
+        [
+            Result(state=State.WARN, summary='Queries: 205.00/s (warn/crit at 200.00/s/300.00/s)'),
+            Metric('unbound_queries_rate', 205.0, levels=(200.0, 300.0)),
+            *QUERIES_TRANSPORT_RESULTS,
+        ]
+    ),
+    (
+        {'levels_lower': ('fixed', (300.0, 210.0))},
+        [
+            Result(state=State.CRIT, summary='Queries: 205.00/s (warn/crit below 300.00/s/210.00/s)'),
+            Metric('unbound_queries_rate', 205.0),
+            *QUERIES_TRANSPORT_RESULTS,
+        ]
+    ),
+])
+def test_check_unbound_queries(monkeypatch, params, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_queries('default', params, EXAMPLE_PARSED)) == result
+
+
+def test_check_unbound_queries_predictive(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    params = {'levels_upper': ('predictive', ('predict_unbound_queries_rate', 100.0, (150.0, 200.0)))}
+    results = list(unbound.check_unbound_queries('default', params, EXAMPLE_PARSED))
+    assert results[0].state == State.CRIT
+    assert Metric('unbound_queries_rate', 205.0, levels=(150.0, 200.0)) in results
+    assert Metric('predict_unbound_queries_rate', 100.0) in results
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_prefetch(section, result):
+    assert list(unbound.discover_unbound_prefetch(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary='Prefetches: 0.00/s'),
+            Metric('unbound_prefetch_rate', 0.0),
+            Result(state=State.OK, summary=f'Prefetches of cache hits: {unbound.render.percent(0.0)}'),
+            Metric('unbound_prefetch_ratio', 0.0),
+            Result(state=State.OK, summary='Expired answers: 0.00/s'),
+            Metric('unbound_expired_rate', 0.0),
+            Result(state=State.OK, summary=f'Expired answers of queries: {unbound.render.percent(0.0)}'),
+            Metric('unbound_expired_ratio', 0.0),
+            Result(state=State.OK, notice='Recursive replies: 34.00/s'),
+            Metric('unbound_recursive_replies_rate', 34.0),
+        ]
+    ),
+    (
+        {'levels_prefetch_ratio': ('fixed', (20.0, 40.0)), 'levels_expired_ratio': ('fixed', (5.0, 10.0))},
+        _parse_with({'total.num.prefetch': '50', 'total.num.expired': '41'}),
+        [
+            Result(state=State.OK, summary='Prefetches: 50.00/s'),
+            Metric('unbound_prefetch_rate', 50.0),
+            Result(state=State.WARN, summary='Prefetches of cache hits: 29.24% (warn/crit at 20.00%/40.00%)'),
+            Metric('unbound_prefetch_ratio', 50 * 100.0 / 171, levels=(20.0, 40.0)),
+            Result(state=State.OK, summary='Expired answers: 41.00/s'),
+            Metric('unbound_expired_rate', 41.0),
+            Result(state=State.CRIT, summary='Expired answers of queries: 20.00% (warn/crit at 5.00%/10.00%)'),
+            Metric('unbound_expired_ratio', 20.0, levels=(5.0, 10.0)),
+            Result(state=State.OK, notice='Recursive replies: 34.00/s'),
+            Metric('unbound_recursive_replies_rate', 34.0),
+        ]
+    ),
+])
+def test_check_unbound_prefetch(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_prefetch('default', params, section)) == result
+
+
+def test_check_unbound_prefetch_initializing(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_prefetch('default', {}, EXAMPLE_PARSED))
+    assert len(value_store['unbound_counters'][3]) == len(unbound.UNBOUND_PREFETCH_COUNTERS)
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_dnssec(section, result):
+    assert list(unbound.discover_unbound_dnssec(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, notice='Secure answers: 0.00/s'),
+            Metric('unbound_answers_secure_rate', 0.0),
+            Result(state=State.OK, notice='Bogus answers: 0.00/s'),
+            Metric('unbound_answers_bogus_rate', 0.0),
+            Result(state=State.OK, notice='Bogus RRsets: 0.00/s'),
+            Metric('unbound_rrset_bogus_rate', 0.0),
+            Result(state=State.OK, summary=f'Bogus of all answers: {unbound.render.percent(0.0)}'),
+            Metric('unbound_answers_bogus_ratio', 0.0),
+            Result(state=State.OK, notice=f'Secure of all answers: {unbound.render.percent(0.0)}'),
+            Metric('unbound_answers_secure_ratio', 0.0),
+        ]
+    ),
+    (
+        {
+            'levels_bogus': ('fixed', (10.0, 100.0)),
+            'levels_bogus_ratio': ('fixed', (1.0, 5.0)),
+            'levels_rrset_bogus': ('fixed', (1.0, 10.0)),
+        },
+        _parse_with({'num.answer.secure': '100', 'num.answer.bogus': '41', 'num.rrset.bogus': '2'}),
+        [
+            Result(state=State.OK, notice='Secure answers: 100.00/s'),
+            Metric('unbound_answers_secure_rate', 100.0),
+            Result(state=State.WARN, summary='Bogus answers: 41.00/s (warn/crit at 10.00/s/100.00/s)'),
+            Metric('unbound_answers_bogus_rate', 41.0, levels=(10.0, 100.0)),
+            Result(state=State.WARN, summary='Bogus RRsets: 2.00/s (warn/crit at 1.00/s/10.00/s)'),
+            Metric('unbound_rrset_bogus_rate', 2.0, levels=(1.0, 10.0)),
+            Result(state=State.CRIT, summary='Bogus of all answers: 20.00% (warn/crit at 1.00%/5.00%)'),
+            Metric('unbound_answers_bogus_ratio', 20.0, levels=(1.0, 5.0)),
+            Result(state=State.OK, notice='Secure of all answers: 48.78%'),
+            Metric('unbound_answers_secure_ratio', 100 * 100.0 / 205),
+        ]
+    ),
+])
+def test_check_unbound_dnssec(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_dnssec('default', params, section)) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_cache_tables(section, result):
+    assert list(unbound.discover_unbound_cache_tables(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary='Message cache entries: 10'),
+            Metric('unbound_cache_msg_entries', 10.0),
+            Result(state=State.OK, notice='Message cache max collisions: 0'),
+            Metric('unbound_cache_msg_collisions', 0.0),
+            Result(state=State.OK, notice='Message cache growth: 10.00/s'),
+            Metric('unbound_cache_msg_growth', 10.0),
+            Result(state=State.OK, summary='RRset cache entries: 8'),
+            Metric('unbound_cache_rrset_entries', 8.0),
+            Result(state=State.OK, notice='RRset cache max collisions: 0'),
+            Metric('unbound_cache_rrset_collisions', 0.0),
+            Result(state=State.OK, notice='RRset cache growth: 8.00/s'),
+            Metric('unbound_cache_rrset_growth', 8.0),
+            Result(state=State.OK, summary='Infrastructure cache entries: 1'),
+            Metric('unbound_cache_infra_entries', 1.0),
+            Result(state=State.OK, notice='Infrastructure cache growth: 1.00/s'),
+            Metric('unbound_cache_infra_growth', 1.0),
+            Result(state=State.OK, summary='Key cache entries: 0'),
+            Metric('unbound_cache_key_entries', 0.0),
+            Result(state=State.OK, notice='Key cache growth: 0.00/s'),
+            Metric('unbound_cache_key_growth', 0.0),
+        ]
+    ),
+    (
+        {'levels_collisions': ('fixed', (5, 10))},
+        _parse_with({'rrset.cache.max_collisions': '7'}),
+        [
+            Result(state=State.OK, summary='Message cache entries: 10'),
+            Metric('unbound_cache_msg_entries', 10.0),
+            Result(state=State.OK, summary='Message cache max collisions: 0'),
+            Metric('unbound_cache_msg_collisions', 0.0, levels=(5.0, 10.0)),
+            Result(state=State.OK, notice='Message cache growth: 10.00/s'),
+            Metric('unbound_cache_msg_growth', 10.0),
+            Result(state=State.OK, summary='RRset cache entries: 8'),
+            Metric('unbound_cache_rrset_entries', 8.0),
+            Result(state=State.WARN, summary='RRset cache max collisions: 7 (warn/crit at 5/10)'),
+            Metric('unbound_cache_rrset_collisions', 7.0, levels=(5.0, 10.0)),
+            Result(state=State.OK, notice='RRset cache growth: 8.00/s'),
+            Metric('unbound_cache_rrset_growth', 8.0),
+            Result(state=State.OK, summary='Infrastructure cache entries: 1'),
+            Metric('unbound_cache_infra_entries', 1.0),
+            Result(state=State.OK, notice='Infrastructure cache growth: 1.00/s'),
+            Metric('unbound_cache_infra_growth', 1.0),
+            Result(state=State.OK, summary='Key cache entries: 0'),
+            Metric('unbound_cache_key_entries', 0.0),
+            Result(state=State.OK, notice='Key cache growth: 0.00/s'),
+            Metric('unbound_cache_key_growth', 0.0),
+        ]
+    ),
+])
+def test_check_unbound_cache_tables(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {})
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_cache_tables('default', params, section)) == result
+
+
+def _rates_instance(now, up, **counters):
+    return unbound.parse_unbound(
+        [['time.now', str(now)], ['time.up', str(up)]] + [[key, str(value)] for key, value in counters.items()]
+    )['default']
+
+
+def test_counter_rates(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(unbound.RatesUnavailable, match='Initializing'):
+        unbound.counter_rates(_rates_instance(100, 10), {'a': 100, 'b': 5})
+    assert value_store == {'unbound_counters': _counter_state(100, 10, {'a': 100, 'b': 5})}
+    assert unbound.counter_rates(_rates_instance(160, 70), {'a': 700, 'b': 5}) == {'a': 10.0, 'b': 0.0}
+    assert unbound.counter_rates(_rates_instance(220, 130), {'a': 700, 'b': 65}) == {'a': 0.0, 'b': 1.0}
+
+
+def test_counter_rates_same_snapshot(monkeypatch):
+    value_store = {'unbound_counters': _counter_state(100, 10, {'a': 100})}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        unbound.counter_rates(_rates_instance(100, 10), {'a': 100})
+    assert value_store == {'unbound_counters': _counter_state(100, 10, {'a': 100})}
+
+
+@pytest.mark.parametrize('now, up, counters, message', [
+    (160, 5, {'a': 700}, 'restarted'),
+    (160, 70, {'a': 50}, 'reset'),
+    (160, 70, {'b': 700}, 'changed'),
+])
+def test_counter_rates_rebaseline(monkeypatch, now, up, counters, message):
+    value_store = {'unbound_counters': _counter_state(100, 10, {'a': 100})}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(unbound.RatesUnavailable, match=message):
+        unbound.counter_rates(_rates_instance(now, up), counters)
+    assert value_store == {'unbound_counters': _counter_state(now, up, counters)}
+
+
+def test_counter_rates_new_counters(monkeypatch):
+    # unbound only reports some counters, e.g. rare query types, once they are non-zero
+    value_store = {'unbound_counters': _counter_state(100, 10, {'a': 100, 'b': 10})}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    assert unbound.counter_rates(_rates_instance(160, 70), {'a': 700, 'c': 3, 'b': 70}) == {'a': 10.0, 'b': 1.0}
+    assert value_store == {'unbound_counters': _counter_state(160, 70, {'a': 700, 'c': 3, 'b': 70})}
+    assert unbound.counter_rates(_rates_instance(220, 130), {'a': 760, 'c': 63}) == {'a': 1.0, 'c': 1.0}
+
+
+def test_check_unbound_query_types_new_type(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_query_types('default', {}, EXAMPLE_PARSED))
+    section = unbound.parse_unbound([
+        [key, str(EXAMPLE_SECTION['time.now'] + 60) if key == 'time.now' else value]
+        for key, value in EXAMPLE_STRING_TABLE
+    ] + [['num.query.type.ANY', '5']])
+    results = list(unbound.check_unbound_query_types('default', {}, section))
+    assert Metric('unbound_qtype_A', 0.0) in results
+    assert not any(isinstance(result, Metric) and result.name == 'unbound_qtype_ANY' for result in results)
+
+
+def test_counter_rates_not_monotonic(monkeypatch):
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: {'unbound_counters': _counter_state(100, 10, {'a': 100})})
+    assert unbound.counter_rates(_rates_instance(160, 70), {'a': 40}, monotonic=False) == {'a': -1.0}
+
+
+def test_check_unbound_restart(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_cache('default', {}, EXAMPLE_PARSED))
+    restarted = _parse_with({
+        'time.now': str(EXAMPLE_SECTION['time.now'] + 60),
+        'time.up': '30',
+        'total.num.cachehits': '3',
+        'total.num.cachemiss': '1',
+    })
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.check_unbound_cache('default', {}, restarted))
+    results = list(unbound.check_unbound_cache('default', {}, _parse_with({
+        'time.now': str(EXAMPLE_SECTION['time.now'] + 120),
+        'time.up': '90',
+        'total.num.cachehits': '63',
+        'total.num.cachemiss': '61',
+    })))
+    assert Metric('cache_hit_rate', 1.0) in results
+    assert Metric('cache_misses_rate', 1.0) in results
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_uptime(section, result):
+    assert list(unbound.discover_unbound_uptime(section)) == result
+
+
+@pytest.mark.parametrize('params, state', [
+    ({}, State.OK),
+    ({'levels_lower': ('fixed', (3600.0, 600.0))}, State.WARN),
+])
+def test_check_unbound_uptime(params, state):
+    results = list(unbound.check_unbound_uptime('default', params, EXAMPLE_PARSED))
+    assert results[0] == Result(
+        state=State.OK,
+        summary=f'Up since {unbound.render.datetime(EXAMPLE_SECTION["time.now"] - EXAMPLE_SECTION["time.up"])}',
+    )
+    assert results[1].state == state
+    assert results[2].name == 'uptime'
+    assert results[2].value == EXAMPLE_SECTION['time.up']
+
+
+CLUSTER_SECTION = {
+    'node1': EXAMPLE_PARSED,
+    'node2': _parse_with({
+        'total.num.cachehits': '29',
+        'total.num.cachemiss': '1',
+        'num.answer.rcode.NOERROR': '20',
+        'num.answer.rcode.NXDOMAIN': '10',
+        'num.answer.rcode.REFUSED': '0',
+        'num.answer.rcode.nodata': '0',
+        'unwanted.replies': '2',
+    }),
+    'node3': None,
+}
+
+
+def test_cluster_check_unbound_cache(monkeypatch):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True, store_key='': dict(counters))
+    results = list(unbound.cluster_check_unbound_cache('default', {'levels_node_imbalance': ('fixed', (1.5, 2.0))}, CLUSTER_SECTION))
+    assert Metric('cache_hit_rate', 200.0) in results
+    assert Metric('cache_misses_rate', 35.0) in results
+    assert Metric('cache_hit_ratio', 200 * 100.0 / 235) in results
+    assert Result(
+        state=State.WARN,
+        summary='Busiest node node1, max/mean imbalance: 1.74 (warn/crit at 1.50/2.00)',
+    ) in results
+    assert Result(state=State.OK, notice='node2: 30.00/s') in results
+
+
+@pytest.mark.parametrize('check', [
+    lambda section: unbound.cluster_check_unbound_cache(
+        'default', unbound.check_plugin_unbound_cache.check_default_parameters, section,
+    ),
+    lambda section: unbound.cluster_check_unbound_answers(
+        'default', unbound.check_plugin_unbound_answers.check_default_parameters, section,
+    ),
+])
+def test_cluster_check_unbound_failover(monkeypatch, check):
+    # active/standby pair, the active node carries all the traffic
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True, store_key='': dict(counters))
+    standby = {key: '0' for key, _value in EXAMPLE_STRING_TABLE if key.startswith(('total.num.', 'num.answer.rcode.'))}
+    results = list(check({'active': EXAMPLE_PARSED, 'standby': _parse_with(standby)}))
+    assert Result(state=State.OK, notice='Busiest node active, max/mean imbalance: 2.00') in results
+    assert Metric('unbound_cluster_imbalance', 2.0) in results
+
+
+def test_cluster_check_unbound_answers(monkeypatch):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True, store_key='': dict(counters))
+    results = list(unbound.cluster_check_unbound_answers('default', {}, CLUSTER_SECTION))
+    assert Metric('unbound_answers_NOERROR', 45.0) in results
+    assert Metric('unbound_answers_NXDOMAIN', 103.0) in results
+    assert Result(state=State.OK, summary='Answers: 235.00/s') in results
+    assert Result(state=State.OK, notice=f'REFUSED share: {unbound.render.percent(87 * 100.0 / 235)}') in results
+    assert all(getattr(result, 'state', State.OK) == State.OK for result in results)
+
+
+def test_cluster_check_unbound_unwanted_replies(monkeypatch):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True, store_key='': dict(counters))
+    assert list(unbound.cluster_check_unbound_unwanted_replies('default', CLUSTER_SECTION)) == [
+        Result(state=State.OK, summary='Unwanted Replies: 2.00/s'),
+        Metric('unbound_unwanted_replies', 2.0, levels=(10.0, 100.0)),
+        Result(state=State.OK, notice='node1: 0.00/s'),
+        Result(state=State.OK, notice='node2: 2.00/s'),
+    ]
+
+
+def test_cluster_check_unbound_node_rates(monkeypatch):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+    section = {
+        'node1': EXAMPLE_PARSED,
+        'node2': unbound.parse_unbound([['cache.age', '400'], ['cache.max_age', '300'], *EXAMPLE_STRING_TABLE]),
+    }
+    with pytest.raises(IgnoreResultsError):
+        list(unbound.cluster_check_unbound_unwanted_replies('default', section))
+    assert list(value_store) == ['unbound_counters.node1']
+
+    section['node1'] = _parse_with({'time.now': str(EXAMPLE_SECTION['time.now'] + 60), 'unwanted.replies': '60'})
+    assert list(unbound.cluster_check_unbound_unwanted_replies('default', section)) == [
+        Result(state=State.OK, summary='Unwanted Replies: 1.00/s'),
+        Metric('unbound_unwanted_replies', 1.0, levels=(10.0, 100.0)),
+        Result(state=State.OK, notice='node1: 1.00/s'),
+        Result(state=State.OK, notice=f'node2: stale data from {unbound.render.timespan(400)} ago, left out'),
+    ]
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_ecs_cachedb(section, result):
+    assert list(unbound.discover_unbound_ecs_cachedb(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, notice='ECS queries: 0.00/s'),
+            Metric('unbound_subnet_rate', 0.0),
+            Result(state=State.OK, notice='ECS cache hits: 0.00/s'),
+            Metric('unbound_subnet_cache_rate', 0.0),
+            Result(state=State.OK, summary=f'ECS cache hit ratio: {unbound.render.percent(100.0)}'),
+            Metric('unbound_subnet_hit_ratio', 100.0),
+            Result(state=State.OK, notice=f'ECS module memory: {unbound.render.bytes(0)}'),
+            Metric('unbound_mem_mod_subnet', 0.0),
+            Result(state=State.OK, notice='Cachedb hits: 0.00/s'),
+            Metric('unbound_cachedb_rate', 0.0),
+            Result(state=State.OK, summary=f'Cachedb hit ratio: {unbound.render.percent(0.0)}'),
+            Metric('unbound_cachedb_hit_ratio', 0.0),
+        ]
+    ),
+    (
+        {'levels_subnet_hit_ratio': ('fixed', (50.0, 25.0)), 'levels_cachedb_hit_ratio': ('fixed', (50.0, 25.0))},
+        _parse_with({'num.query.subnet': '100', 'num.query.subnet_cache': '40', 'num.query.cachedb': '17'}),
+        [
+            Result(state=State.OK, notice='ECS queries: 100.00/s'),
+            Metric('unbound_subnet_rate', 100.0),
+            Result(state=State.OK, notice='ECS cache hits: 40.00/s'),
+            Metric('unbound_subnet_cache_rate', 40.0),
+            Result(state=State.WARN, summary='ECS cache hit ratio: 40.00% (warn/crit below 50.00%/25.00%)'),
+            Metric('unbound_subnet_hit_ratio', 40.0),
+            Result(state=State.OK, notice=f'ECS module memory: {unbound.render.bytes(0)}'),
+            Metric('unbound_mem_mod_subnet', 0.0),
+            Result(state=State.OK, notice='Cachedb hits: 17.00/s'),
+            Metric('unbound_cachedb_rate', 17.0),
+            Result(state=State.OK, summary='Cachedb hit ratio: 50.00%'),
+            Metric('unbound_cachedb_hit_ratio', 50.0),
+        ]
+    ),
+])
+def test_check_unbound_ecs_cachedb(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_ecs_cachedb('default', params, section)) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_upstream(section, result):
+    assert list(unbound.discover_unbound_upstream(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary='Outgoing queries: 29.00/s'),
+            Metric('unbound_upstream_rate', 29.0),
+            Metric('unbound_upstream_udp_rate', 29.0),
+            Metric('unbound_upstream_tcp_rate', 0.0),
+            Result(state=State.OK, summary='Outgoing queries per recursive reply: 0.85'),
+            Metric('unbound_upstream_amplification', 29 / 34),
+            Result(state=State.OK, notice='Outgoing queries per client query: 0.14'),
+            Metric('unbound_upstream_per_query', 29 / 205),
+            Result(state=State.OK, notice=f'TCP share: {unbound.render.percent(0.0)}'),
+            Metric('unbound_upstream_tcp_share', 0.0),
+        ]
+    ),
+    (
+        {'levels_amplification': ('fixed', (3.0, 5.0)), 'levels_tcp_share': ('fixed', (10.0, 25.0))},
+        _parse_with({'num.query.udpout': '100', 'num.query.tcpout': '20'}),
+        [
+            Result(state=State.OK, summary='Outgoing queries: 120.00/s'),
+            Metric('unbound_upstream_rate', 120.0),
+            Metric('unbound_upstream_udp_rate', 100.0),
+            Metric('unbound_upstream_tcp_rate', 20.0),
+            Result(state=State.WARN, summary='Outgoing queries per recursive reply: 3.53 (warn/crit at 3.00/5.00)'),
+            Metric('unbound_upstream_amplification', 120 / 34, levels=(3.0, 5.0)),
+            Result(state=State.OK, notice='Outgoing queries per client query: 0.59'),
+            Metric('unbound_upstream_per_query', 120 / 205),
+            Result(state=State.WARN, summary='TCP share: 16.67% (warn/crit at 10.00%/25.00%)'),
+            Metric('unbound_upstream_tcp_share', 20 * 100.0 / 120, levels=(10.0, 25.0)),
+        ]
+    ),
+])
+def test_check_unbound_upstream(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_upstream('default', params, section)) == result
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_query_types(section, result):
+    assert list(unbound.discover_unbound_query_types(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary=f'Most frequent: A ({unbound.render.percent(170 * 100.0 / 205)})'),
+            Result(state=State.OK, notice='A: 170.00/s'),
+            Metric('unbound_qtype_A', 170.0),
+            Result(state=State.OK, notice=f'A share: {unbound.render.percent(170 * 100.0 / 205)}'),
+            Result(state=State.OK, notice='AAAA: 21.00/s'),
+            Metric('unbound_qtype_AAAA', 21.0),
+            Result(state=State.OK, notice=f'AAAA share: {unbound.render.percent(21 * 100.0 / 205)}'),
+            Result(state=State.OK, notice='SRV: 14.00/s'),
+            Metric('unbound_qtype_SRV', 14.0),
+            Result(state=State.OK, notice=f'SRV share: {unbound.render.percent(14 * 100.0 / 205)}'),
+        ]
+    ),
+    (
+        {'levels_upper_ANY': ('fixed', (10.0, 100.0)), 'levels_share_ANY': ('fixed', (5.0, 10.0))},
+        unbound.parse_unbound([
+            [key, '75' if key == 'num.query.type.A' else value] for key, value in EXAMPLE_STRING_TABLE
+        ] + [['num.query.type.ANY', '25']]),
+        [
+            Result(state=State.OK, summary=f'Most frequent: A ({unbound.render.percent(75 * 100.0 / 135)})'),
+            Result(state=State.OK, notice='A: 75.00/s'),
+            Metric('unbound_qtype_A', 75.0),
+            Result(state=State.OK, notice=f'A share: {unbound.render.percent(75 * 100.0 / 135)}'),
+            Result(state=State.WARN, notice='ANY: 25.00/s (warn/crit at 10.00/s/100.00/s)'),
+            Metric('unbound_qtype_ANY', 25.0, levels=(10.0, 100.0)),
+            Result(
+                state=State.CRIT,
+                notice=(
+                    f'ANY share: {unbound.render.percent(25 * 100.0 / 135)} '
+                    f'(warn/crit at {unbound.render.percent(5.0)}/{unbound.render.percent(10.0)})'
+                ),
+            ),
+            Result(state=State.OK, notice='AAAA: 21.00/s'),
+            Metric('unbound_qtype_AAAA', 21.0),
+            Result(state=State.OK, notice=f'AAAA share: {unbound.render.percent(21 * 100.0 / 135)}'),
+            Result(state=State.OK, notice='SRV: 14.00/s'),
+            Metric('unbound_qtype_SRV', 14.0),
+            Result(state=State.OK, notice=f'SRV share: {unbound.render.percent(14 * 100.0 / 135)}'),
+        ]
+    ),
+])
+def test_check_unbound_query_types(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_query_types('default', params, section)) == result
+
+
+TCP_TLS_DEFAULT_PARAMS = {'incoming_num_tcp': 10, 'levels_tcp_usage': ('fixed', (80.0, 90.0))}
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_tcp_tls(section, result):
+    assert list(unbound.discover_unbound_tcp_tls(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        TCP_TLS_DEFAULT_PARAMS,
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, summary=f'TCP buffer usage: {unbound.render.percent(0.0)}'),
+            Metric('unbound_tcp_buffer_utilization', 0.0, levels=(80.0, 90.0)),
+            Result(state=State.OK, summary='0 of 10 buffers'),
+            Metric('unbound_tcp_buffers', 0.0, boundaries=(0.0, 10.0)),
+            Result(state=State.OK, notice='TCP: 0.00/s'),
+            Metric('unbound_queries_tcp_rate', 0.0),
+            Result(state=State.OK, notice='TLS: 0.00/s'),
+            Metric('unbound_queries_tls_rate', 0.0),
+            Result(state=State.OK, notice='TLS resumed: 0.00/s'),
+            Metric('unbound_queries_tls_resume_rate', 0.0),
+            Result(state=State.OK, notice='HTTPS: 0.00/s'),
+            Metric('unbound_queries_https_rate', 0.0),
+        ]
+    ),
+    (
+        {**TCP_TLS_DEFAULT_PARAMS, 'levels_tls_resume_ratio': ('fixed', (50.0, 25.0))},
+        _parse_with({
+            'total.tcpusage': '9',
+            'num.query.tcp': '60',
+            'num.query.tls': '40',
+            'num.query.tls.resume': '12',
+        }),
+        [
+            Result(state=State.CRIT, summary='TCP buffer usage: 90.00% (warn/crit at 80.00%/90.00%)'),
+            Metric('unbound_tcp_buffer_utilization', 90.0, levels=(80.0, 90.0)),
+            Result(state=State.OK, summary='9 of 10 buffers'),
+            Metric('unbound_tcp_buffers', 9.0, boundaries=(0.0, 10.0)),
+            Result(state=State.OK, notice='TCP: 60.00/s'),
+            Metric('unbound_queries_tcp_rate', 60.0),
+            Result(state=State.OK, notice='TLS: 40.00/s'),
+            Metric('unbound_queries_tls_rate', 40.0),
+            Result(state=State.OK, notice='TLS resumed: 12.00/s'),
+            Metric('unbound_queries_tls_resume_rate', 12.0),
+            Result(state=State.OK, notice='HTTPS: 0.00/s'),
+            Metric('unbound_queries_https_rate', 0.0),
+            Result(state=State.WARN, summary='TLS resume ratio: 30.00% (warn/crit below 50.00%/25.00%)'),
+            Metric('unbound_tls_resume_ratio', 30.0),
+        ]
+    ),
+])
+def test_check_unbound_tcp_tls(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_tcp_tls('default', params, section)) == result
+
+
+def test_check_unbound_tcp_tls_without_rates(monkeypatch):
+    def counter_rates(_instance, _counters, monotonic=True):
+        raise unbound.RatesUnavailable('Initializing counters')
+
+    monkeypatch.setattr(unbound, 'counter_rates', counter_rates)
+    assert [
+        result for result in unbound.check_unbound_tcp_tls('default', TCP_TLS_DEFAULT_PARAMS, EXAMPLE_PARSED)
+        if isinstance(result, Metric)
+    ] == [
+        Metric('unbound_tcp_buffer_utilization', 0.0, levels=(80.0, 90.0)),
+        Metric('unbound_tcp_buffers', 0.0, boundaries=(0.0, 10.0)),
+    ]
+
+
+@pytest.mark.parametrize('section, result', [
+    (EXAMPLE_PARSED, [Service(item='default')]),
+    (EMPTY_PARSED, []),
+])
+def test_discover_unbound_ratelimit(section, result):
+    assert list(unbound.discover_unbound_ratelimit(section)) == result
+
+
+@pytest.mark.parametrize('params, section, result', [
+    (
+        {},
+        EXAMPLE_PARSED,
+        [
+            Result(state=State.OK, notice='IP rate limited: 0.00/s'),
+            Metric('unbound_ip_ratelimited_rate', 0.0),
+            Result(state=State.OK, notice='Zone rate limited: 0.00/s'),
+            Metric('unbound_ratelimited_rate', 0.0),
+            Result(state=State.OK, notice='Valid cookies: 0.00/s'),
+            Metric('unbound_cookie_valid_rate', 0.0),
+            Result(state=State.OK, notice='Client cookies only: 0.00/s'),
+            Metric('unbound_cookie_client_rate', 0.0),
+            Result(state=State.OK, notice='Invalid cookies: 0.00/s'),
+            Metric('unbound_cookie_invalid_rate', 0.0),
+            Result(state=State.OK, summary=f'Rate limited queries: {unbound.render.percent(0.0)}'),
+            Metric('unbound_ratelimited_ratio', 0.0),
+            Result(state=State.OK, summary=f'Queries with invalid cookies: {unbound.render.percent(0.0)}'),
+            Metric('unbound_cookie_invalid_ratio', 0.0),
+        ]
+    ),
+    (
+        {
+            'levels_ip_ratelimited': ('fixed', (10.0, 100.0)),
+            'levels_ratelimited_ratio': ('fixed', (1.0, 5.0)),
+            'levels_cookie_invalid_ratio': ('fixed', (1.0, 5.0)),
+        },
+        _parse_with({
+            'total.num.queries_ip_ratelimited': '15',
+            'num.query.ratelimited': '5',
+            'total.num.queries_cookie_invalid': '4',
+        }),
+        [
+            Result(state=State.WARN, summary='IP rate limited: 15.00/s (warn/crit at 10.00/s/100.00/s)'),
+            Metric('unbound_ip_ratelimited_rate', 15.0, levels=(10.0, 100.0)),
+            Result(state=State.OK, notice='Zone rate limited: 5.00/s'),
+            Metric('unbound_ratelimited_rate', 5.0),
+            Result(state=State.OK, notice='Valid cookies: 0.00/s'),
+            Metric('unbound_cookie_valid_rate', 0.0),
+            Result(state=State.OK, notice='Client cookies only: 0.00/s'),
+            Metric('unbound_cookie_client_rate', 0.0),
+            Result(state=State.OK, notice='Invalid cookies: 4.00/s'),
+            Metric('unbound_cookie_invalid_rate', 4.0),
+            Result(state=State.CRIT, summary='Rate limited queries: 9.76% (warn/crit at 1.00%/5.00%)'),
+            Metric('unbound_ratelimited_ratio', 20 * 100.0 / 205, levels=(1.0, 5.0)),
+            Result(state=State.WARN, summary='Queries with invalid cookies: 1.95% (warn/crit at 1.00%/5.00%)'),
+            Metric('unbound_cookie_invalid_ratio', 4 * 100.0 / 205, levels=(1.0, 5.0)),
+        ]
+    ),
+])
+def test_check_unbound_ratelimit(monkeypatch, params, section, result):
+    monkeypatch.setattr(unbound, 'counter_rates', lambda _instance, counters, monotonic=True: dict(counters))
+    assert list(unbound.check_unbound_ratelimit('default', params, section)) == result
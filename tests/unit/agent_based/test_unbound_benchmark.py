@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Benchmarks for the Unbound DNS Server checks
+#
+# Copyright (C) 2025 Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+"""Performance regression tests for the parse, discovery and check functions
+
+The functions run against synthetic ``stats_noreset`` outputs of 1 to 256
+threads with extended statistics. Each test records the time per call and
+the peak allocation as test properties (see ``--junitxml``) and fails if
+they exceed the budget per line of agent output. The budgets are generous
+on purpose, they catch accidental quadratic behaviour, not noise. Slow
+runners can scale them with UNBOUND_BENCHMARK_FACTOR.
+
+The benchmarks are skipped unless UNBOUND_BENCHMARK is set, timings of a
+normal (coverage) test run on a shared runner are too noisy.
+"""
+
+import os
+import time
+import tracemalloc
+
+import pytest  # type: ignore[import]
+from cmk.agent_based.v2 import IgnoreResultsError
+from cmk.base.plugins.agent_based import unbound
+
+from test_unbound import EXAMPLE_STRING_TABLE
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get('UNBOUND_BENCHMARK'),
+    reason='benchmarks only run with UNBOUND_BENCHMARK set',
+)
+
+THREADS = (1, 16, 256)
+
+FACTOR = float(os.environ.get('UNBOUND_BENCHMARK_FACTOR', '1'))
+
+# Budget per call: fixed overhead plus a share per line of agent output
+TIME_BUDGET = {
+    'parse': (200e-6, 20e-6),
+    'discovery': (50e-6, 2e-6),
+    'check': (500e-6, 10e-6),
+}
+MEMORY_BUDGET = {
+    'parse': (16 * 1024, 512),
+    'discovery': (4 * 1024, 16),
+    'check': (64 * 1024, 512),
+}
+
+ITERATIONS = 10
+
+QTYPES = [
+    'A', 'AAAA', 'ANY', 'CAA', 'CNAME', 'DNSKEY', 'DS', 'HINFO', 'HTTPS', 'MX', 'NAPTR', 'NS',
+    'NULL', 'PTR', 'SOA', 'SRV', 'SSHFP', 'SVCB', 'TLSA', 'TXT', 'URI', 'ZONEMD',
+] + [f'TYPE{qtype}' for qtype in range(65280, 65320)]
+
+RCODES = [
+    'NOERROR', 'FORMERR', 'SERVFAIL', 'NXDOMAIN', 'NOTIMPL', 'REFUSED', 'YXDOMAIN',
+    'YXRRSET', 'NXRRSET', 'NOTAUTH', 'NOTZONE', 'nodata',
+]
+
+CHECK_PLUGINS = {
+    name[len('check_plugin_'):]: plugin
+    for name, plugin in vars(unbound).items()
+    if name.startswith('check_plugin_')
+}
+
+
+def synthetic_string_table(threads, step=0):
+    """Stats of an instance with extended statistics after ``step`` minutes"""
+    def counter(value):
+        return value if '.' in value else str(int(value) * (step + 1))
+
+    thread_stats = [
+        (key[len('thread0.'):], value)
+        for key, value in EXAMPLE_STRING_TABLE
+        if key.startswith('thread0.')
+    ]
+    string_table = [
+        [f'thread{thread}.{key}', counter(value)]
+        for thread in range(threads)
+        for key, value in thread_stats
+    ]
+    for key, value in EXAMPLE_STRING_TABLE:
+        if key.startswith(('thread0.', 'num.query.type.', 'num.answer.rcode.')):
+            continue
+        if key == 'time.now':
+            value = str(float(value) + 60 * step)
+        string_table.append([key, counter(value)])
+    string_table.extend([f'num.query.type.{qtype}', counter('10')] for qtype in QTYPES)
+    string_table.extend([f'num.answer.rcode.{rcode}', counter('10')] for rcode in RCODES)
+    return string_table
+
+
+def _measure(kind, lines, call, arguments, record_property):
+    """Time ``call`` over ``arguments`` and assert the budgets"""
+    start = time.perf_counter()
+    for argument in arguments:
+        call(argument)
+    per_call = (time.perf_counter() - start) / len(arguments)
+
+    tracemalloc.start()
+    try:
+        call(arguments[-1])
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    record_property('lines', lines)
+    record_property('seconds_per_call', per_call)
+    record_property('peak_bytes', peak)
+
+    fixed, per_line = TIME_BUDGET[kind]
+    assert per_call <= (fixed + per_line * lines) * FACTOR
+    fixed, per_line = MEMORY_BUDGET[kind]
+    assert peak <= (fixed + per_line * lines) * FACTOR
+
+
+@pytest.mark.parametrize('threads', THREADS)
+def test_benchmark_parse_unbound(threads, record_property):
+    string_table = synthetic_string_table(threads)
+    _measure(
+        'parse',
+        len(string_table),
+        unbound.parse_unbound,
+        [string_table] * ITERATIONS,
+        record_property,
+    )
+
+
+@pytest.mark.parametrize('threads', THREADS)
+@pytest.mark.parametrize('plugin', CHECK_PLUGINS)
+def test_benchmark_discovery(plugin, threads, record_property):
+    string_table = synthetic_string_table(threads)
+    section = unbound.parse_unbound(string_table)
+    discovery = CHECK_PLUGINS[plugin].discovery_function
+    _measure(
+        'discovery',
+        len(string_table),
+        lambda section: list(discovery(section)),
+        [section] * ITERATIONS,
+        record_property,
+    )
+
+
+@pytest.mark.parametrize('threads', THREADS)
+@pytest.mark.parametrize('plugin', CHECK_PLUGINS)
+def test_benchmark_check(monkeypatch, plugin, threads, record_property):
+    value_store = {}
+    monkeypatch.setattr(unbound, 'get_value_store', lambda: value_store)
+
+    check_plugin = CHECK_PLUGINS[plugin]
+    arguments = ['default']
+    if check_plugin.check_default_parameters is not None:
+        arguments.append(check_plugin.check_default_parameters)
+
+    def check(section):
+        try:
+            return list(check_plugin.check_function(*arguments, section))
+        except IgnoreResultsError:
+            return []
+
+    string_tables = [synthetic_string_table(threads, step) for step in range(ITERATIONS + 1)]
+    sections = [unbound.parse_unbound(string_table) for string_table in string_tables]
+    # the first run initializes the counters
+    check(sections[0])
+    _measure('check', len(string_tables[0]), check, sections[1:], record_property)
+
+
+def test_benchmark_parse_scales_linearly():
+    def per_line(threads):
+        string_table = synthetic_string_table(threads)
+        best = min(
+            _time(unbound.parse_unbound, string_table)
+            for _repeat in range(3)
+        )
+        return best / len(string_table)
+
+    assert per_line(256) <= 2 * per_line(16) * FACTOR
+
+
+def _time(call, argument):
+    start = time.perf_counter()
+    call(argument)
+    return time.perf_counter() - start
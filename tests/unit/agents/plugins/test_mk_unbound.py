@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Checks for the Unbound DNS Server status-
+#
+# Copyright (C) 2025 Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+import importlib.util
+import os
+import shutil
+import socketserver
+import ssl
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+import pytest  # type: ignore[import]
+
+ROOT = Path(__file__).resolve().parents[4]
+
+
+def _load(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+mk_unbound = _load('mk_unbound', ROOT / 'agents' / 'plugins' / 'mk_unbound.py')
+test_unbound = _load('test_unbound', ROOT / 'tests' / 'unit' / 'agent_based' / 'test_unbound.py')
+
+STATS = ''.join(f'{key}={value}\n' for key, value in test_unbound.EXAMPLE_STRING_TABLE)
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        command = self.rfile.readline()
+        self.server.commands.append(command)
+        if command == b'UBCT1 stats_noreset\n':
+            self.wfile.write(STATS.encode())
+        else:
+            self.wfile.write(b'error unknown command\n')
+
+
+@pytest.fixture
+def control_server(tmp_path):
+    servers = []
+
+    def start(server_class, address, ssl_context=None):
+        server = server_class(address, ControlHandler)
+        server.commands = []
+        if ssl_context is not None:
+            server.socket = ssl_context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _write_config(path, **options):
+    path.write_text('server:\n    verbosity: 1\n\nremote-control:\n' + ''.join(
+        f'    {key}: "{value}"\n' for key, value in options.items()
+    ))
+    return path
+
+
+def _shell_output(tmp_path, plugin_config=''):
+    """Output of the shell plugin with unbound-control replaying STATS"""
+    bindir = tmp_path / 'bin'
+    bindir.mkdir()
+    (tmp_path / 'stats').write_text(STATS)
+    control = bindir / 'unbound-control'
+    control.write_text(f'#!/bin/sh\ncat {tmp_path / "stats"}\n')
+    control.chmod(0o755)
+    (tmp_path / 'unbound.cfg').write_text(plugin_config)
+    return subprocess.run(
+        ['sh', str(ROOT / 'agents' / 'plugins' / 'unbound')],
+        env={**os.environ, 'PATH': f'{bindir}:{os.environ["PATH"]}', 'MK_CONFDIR': str(tmp_path)},
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+
+
+def _python_output(monkeypatch, capsys, tmp_path, plugin_config=''):
+    (tmp_path / 'unbound.cfg').write_text(plugin_config)
+    monkeypatch.setenv('MK_CONFDIR', str(tmp_path))
+    mk_unbound.main()
+    return capsys.readouterr().out.encode()
+
+
+def test_default_instance_unix_socket(monkeypatch, capsys, tmp_path, control_server):
+    server = control_server(socketserver.ThreadingUnixStreamServer, str(tmp_path / 'control.sock'))
+    config = _write_config(tmp_path / 'unbound.conf', **{'control-interface': tmp_path / 'control.sock'})
+    monkeypatch.setattr(mk_unbound, 'DEFAULT_CONFIG', str(config))
+
+    expected = _shell_output(tmp_path)
+    assert _python_output(monkeypatch, capsys, tmp_path) == expected
+    assert expected.startswith(b'<<<unbound:sep(61)>>>\nthread0.num.queries=205\n')
+    assert server.commands == [b'UBCT1 stats_noreset\n']
+
+
+def test_instances(monkeypatch, capsys, tmp_path, control_server):
+    plugin_config = 'UNBOUND_INSTANCES="{}"\nUNBOUND_TIMEOUT=5\n'.format(' '.join(
+        f'{name}:{tmp_path / name}.conf' for name in ('internal', 'external')
+    ))
+    for name in ('internal', 'external'):
+        control_server(socketserver.ThreadingUnixStreamServer, str(tmp_path / f'{name}.sock'))
+        _write_config(tmp_path / f'{name}.conf', **{'control-interface': tmp_path / f'{name}.sock'})
+
+    expected = _shell_output(tmp_path, plugin_config)
+    assert _python_output(monkeypatch, capsys, tmp_path, plugin_config) == expected
+    assert expected.count(b'thread0.num.queries=205\n') == 2
+    assert b'[[[internal]]]\n' in expected and b'[[[external]]]\n' in expected
+
+
+@pytest.mark.parametrize('groups', ['', 'threads', 'histogram qtype mem'])
+def test_groups(monkeypatch, capsys, tmp_path, control_server, groups):
+    control_server(socketserver.ThreadingUnixStreamServer, str(tmp_path / 'control.sock'))
+    config = _write_config(tmp_path / 'unbound.conf', **{'control-interface': tmp_path / 'control.sock'})
+    plugin_config = f'UNBOUND_INSTANCES="main:{config}"\nUNBOUND_GROUPS="{groups}"\n'
+
+    expected = _shell_output(tmp_path, plugin_config)
+    assert _python_output(monkeypatch, capsys, tmp_path, plugin_config) == expected
+    assert (b'thread0.num.queries=205\n' in expected) == ('threads' in groups)
+    assert (b'num.threads=1\n' in expected) == ('threads' not in groups)
+    assert (b'histogram.' in expected) == ('histogram' in groups)
+    assert b'total.num.queries=205\n' in expected
+
+
+def test_histogram_summary(monkeypatch, capsys, tmp_path, control_server):
+    control_server(socketserver.ThreadingUnixStreamServer, str(tmp_path / 'control.sock'))
+    config = _write_config(tmp_path / 'unbound.conf', **{'control-interface': tmp_path / 'control.sock'})
+    monkeypatch.setattr(mk_unbound, 'DEFAULT_CONFIG', str(config))
+    plugin_config = 'UNBOUND_HISTOGRAM=summary\n'
+
+    def run(output, vardir):
+        monkeypatch.setenv('MK_VARDIR', str(vardir))
+        return output()
+
+    outputs = []
+    for step in range(2):
+        (tmp_path / f'shell{step}').mkdir()
+        outputs.append([
+            run(lambda: _shell_output(tmp_path / f'shell{step}', plugin_config), tmp_path / 'shell'),
+            run(lambda: _python_output(monkeypatch, capsys, tmp_path, plugin_config), tmp_path / 'python'),
+        ])
+        for plugin in ('shell', 'python'):
+            # pretend the previous run was a minute ago and before any reply
+            state = tmp_path / plugin / 'cache' / 'unbound.default.histogram'
+            state.write_text(''.join(
+                f'{key}={float(value) - 60:.6f}\n' if key == 'time.now' else f'{key}=0\n'
+                for key, value in (line.split('=', 1) for line in state.read_text().splitlines())
+            ))
+
+    assert outputs[0][0] == outputs[0][1]
+    assert b'histogram.summary.interval=0\n<<<>>>' in outputs[0][0]
+    assert outputs[1][0] == outputs[1][1]
+    assert b'histogram.000000' not in outputs[1][0]
+    assert b'histogram.summary.count=34\nhistogram.summary.p50=0.001536\n' in outputs[1][0]
+
+
+def test_async_failed_refresh(tmp_path):
+    bindir = tmp_path / 'bin'
+    bindir.mkdir()
+    control = bindir / 'unbound-control'
+    control.write_text('#!/bin/sh\nexit 1\n')
+    control.chmod(0o755)
+    (tmp_path / 'unbound.cfg').write_text('UNBOUND_ASYNC=yes\n')
+    subprocess.run(
+        ['sh', str(ROOT / 'agents' / 'plugins' / 'unbound')],
+        env={
+            **os.environ,
+            'PATH': f'{bindir}:{os.environ["PATH"]}',
+            'MK_CONFDIR': str(tmp_path),
+            'MK_VARDIR': str(tmp_path),
+        },
+        stdout=subprocess.PIPE,
+        check=True,
+    )
+
+    # a finished refresh must not leave a pid file behind, it would block
+    # all further refreshes once the pid is reused
+    pid_file = tmp_path / 'cache' / 'unbound.default.pid'
+    for _retry in range(50):
+        if not pid_file.exists():
+            break
+        time.sleep(0.1)
+    assert not pid_file.exists()
+    assert not (tmp_path / 'cache' / 'unbound.default').exists()
+
+
+def test_instance_unreachable(monkeypatch, capsys, tmp_path):
+    config = _write_config(tmp_path / 'unbound.conf', **{'control-interface': tmp_path / 'missing.sock'})
+    output = _python_output(monkeypatch, capsys, tmp_path, f'UNBOUND_INSTANCES="main:{config}"\n')
+    assert output == b'<<<unbound:sep(61)>>>\n[[[main]]]\n<<<>>>\n'
+
+
+def test_tcp_without_cert(monkeypatch, capsys, tmp_path, control_server):
+    server = control_server(socketserver.ThreadingTCPServer, ('127.0.0.1', 0))
+    config = _write_config(
+        tmp_path / 'unbound.conf',
+        **{
+            'control-interface': '127.0.0.1',
+            'control-port': server.server_address[1],
+            'control-use-cert': 'no',
+        },
+    )
+    monkeypatch.setattr(mk_unbound, 'DEFAULT_CONFIG', str(config))
+    assert _python_output(monkeypatch, capsys, tmp_path) == _shell_output(tmp_path)
+
+
+def _openssl_cert(tmp_path, name):
+    subprocess.run(
+        [
+            'openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+            '-subj', f'/CN={name}',
+            '-keyout', str(tmp_path / f'{name}.key'),
+            '-out', str(tmp_path / f'{name}.pem'),
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+
+
+@pytest.mark.skipif(shutil.which('openssl') is None, reason='openssl is required to create certificates')
+def test_tls(monkeypatch, capsys, tmp_path, control_server):
+    _openssl_cert(tmp_path, 'unbound_server')
+    _openssl_cert(tmp_path, 'unbound_control')
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(tmp_path / 'unbound_server.pem', tmp_path / 'unbound_server.key')
+    context.load_verify_locations(tmp_path / 'unbound_control.pem')
+    context.verify_mode = ssl.CERT_REQUIRED
+
+    server = control_server(socketserver.ThreadingTCPServer, ('127.0.0.1', 0), context)
+    config = _write_config(
+        tmp_path / 'unbound.conf',
+        **{'control-interface': '127.0.0.1', 'control-port': server.server_address[1]},
+    )
+    monkeypatch.setattr(mk_unbound, 'DEFAULT_CONFIG', str(config))
+    assert _python_output(monkeypatch, capsys, tmp_path) == _shell_output(tmp_path)
+    assert server.commands == [b'UBCT1 stats_noreset\n']
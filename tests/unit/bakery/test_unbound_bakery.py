@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- encoding: utf-8; py-indent-offset: 4 -*-
+#
+# Tests for the agent bakery plugin of the Unbound DNS Server
+#
+# Copyright (C) 2025 Marius Rieder <marius.rieder@scs.ch>
+#
+# This program is free software; you can redistribute it and/or
+# modify it under the terms of the GNU General Public License
+# as published by the Free Software Foundation; either version 2
+# of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301, USA.
+
+from pathlib import Path
+
+import pytest  # type: ignore[import]
+
+# the bakery API is only part of the commercial editions
+unbound = pytest.importorskip('cmk.base.cee.plugins.bakery.unbound')
+
+
+@pytest.mark.parametrize('conf, lines', [
+    ({'plugin': 'unbound'}, []),
+    (
+        {'plugin': 'unbound', 'instances': [
+            {'name': 'internal', 'config': '/etc/unbound/internal.conf'},
+            {'name': 'external', 'config': '/etc/unbound/external.conf'},
+        ]},
+        ['UNBOUND_INSTANCES="internal:/etc/unbound/internal.conf external:/etc/unbound/external.conf"'],
+    ),
+    ({'plugin': 'unbound', 'instances': []}, []),
+    ({'plugin': 'unbound', 'timeout': 10.0}, ['UNBOUND_TIMEOUT=10']),
+    ({'plugin': 'unbound', 'timeout': 2.5}, ['UNBOUND_TIMEOUT=3']),
+    ({'plugin': 'unbound', 'timeout': 0.4}, ['UNBOUND_TIMEOUT=1']),
+    ({'plugin': 'unbound', 'cache': {'max_age': 300.0}}, ['UNBOUND_ASYNC=yes', 'UNBOUND_MAX_AGE=300']),
+    ({'plugin': 'mk_unbound.py', 'cache': {'max_age': 300.0}}, []),
+    ({'plugin': 'unbound', 'groups': ['threads', 'mem']}, ['UNBOUND_GROUPS="threads mem"']),
+    ({'plugin': 'unbound', 'groups': []}, ['UNBOUND_GROUPS=""']),
+    ({'plugin': 'unbound', 'histogram_summary': True}, ['UNBOUND_HISTOGRAM=summary']),
+    ({'plugin': 'unbound', 'histogram_summary': False}, []),
+])
+def test_get_unbound_config_lines(conf, lines):
+    assert unbound.get_unbound_config_lines(conf) == lines
+
+
+@pytest.mark.parametrize('conf, source, interval', [
+    ({'plugin': 'unbound'}, Path('unbound'), None),
+    ({'plugin': 'mk_unbound.py', 'interval': 60.0}, Path('mk_unbound.py'), 60),
+])
+def test_get_unbound_files(monkeypatch, conf, source, interval):
+    monkeypatch.setattr(unbound, 'Plugin', lambda **kwargs: ('plugin', kwargs))
+    monkeypatch.setattr(unbound, 'PluginConfig', lambda **kwargs: ('config', kwargs))
+    (_plugin, plugin), (_config, config) = unbound.get_unbound_files(conf)
+    assert (plugin['source'], plugin['interval']) == (source, interval)
+    assert (config['target'], config['lines']) == (Path('unbound.cfg'), unbound.get_unbound_config_lines(conf))